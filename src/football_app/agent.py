@@ -2,14 +2,15 @@ from langchain_google_genai import GoogleGenerativeAI
 from langchain.prompts import PromptTemplate
 from langchain.agents import create_react_agent, AgentExecutor
 from langchain import hub
-from typing import List
-from tools import load_tools
+from typing import List, Optional
+from tools import load_tools, ToolSession
 
 
 
-def load_agent() -> AgentExecutor:
+def load_agent(session: Optional[ToolSession] = None) -> AgentExecutor:
     """
-    Load the agent with the given tool names
+    Load the agent with the given tool names.
+    When a session is given, tool observations are memoized in it.
     """
     llm = GoogleGenerativeAI(model="gemini-pro", temperature=0.2)
     
@@ -56,6 +57,9 @@ def load_agent() -> AgentExecutor:
     Thought: I have completed the analysis. No further tools are required.
     Final Answer: [Your final comprehensive analysis, summarizing all insights about the match.]
 
+    ### Conversation So Far:
+    {chat_history}
+
     ### Current Task:
     {input}
 
@@ -66,12 +70,15 @@ def load_agent() -> AgentExecutor:
        input_variables=["match_id",
                         "match_name",
                         "input",
+                        "chat_history",
                         "agent_scratchpad",
                         "tool_names",
                         "tools"],
        template=football_prompt
     )
     tools = load_tools()
+    if session is not None:
+        tools = session.wrap_all(tools)
     agent = create_react_agent(llm, tools=tools, prompt=prompt)
     
     return AgentExecutor(
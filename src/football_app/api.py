@@ -1,11 +1,56 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header, Request, Response
 from pydantic import BaseModel
-from src.football_app.football_stats.matches import get_main_events, get_player_profile, generate_narrative
+from typing import Optional
+from contextlib import asynccontextmanager
+from src.football_app.football_stats.matches import (get_main_events, get_player_profile, generate_narrative,
+                                                     get_events_json, get_events_arrow)
+from src.football_app.football_stats.competitions import get_matches
+from src.football_app.football_stats.metrics import get_advanced_metrics_json, get_advanced_metrics_arrow
+from src.football_app.football_stats.serialization import (dumps, negotiate, NotAcceptableError,
+                                                           JSON_MEDIA_TYPE, ARROW_MEDIA_TYPE)
+from src.football_app.http_cache import make_etag, cached_body, immutable_response
+from src.football_app.workers import run_cpu_bound, shutdown as shutdown_workers
+from src.football_app.football_stats import shared_cache
+from src.football_app.football_stats.memory_budget import (budget, measure, memory_stats,
+                                                            process_peak_rss, MemoryBudgetExceeded)
 import json 
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    shutdown_workers()
+
+
 # Cria a instância do FastAPI
-app = FastAPI(title="Football Insights API")
+app = FastAPI(title="Football Insights API", lifespan=lifespan)
+
+# Medição de memória por requisição (exposta no cabeçalho e em /memory)
+@app.middleware("http")
+async def memory_accounting(request: Request, call_next):
+    with measure("request", stats=None) as measurement:
+        response = await call_next(request)
+    route = getattr(request.scope.get("route"), "path", request.url.path)
+    memory_stats.record(f"{request.method} {route}", measurement["peak_bytes"],
+                        measurement["frame_bytes"])
+    response.headers["X-DataFrame-Bytes"] = str(measurement["frame_bytes"])
+    if measurement["peak_bytes"] is not None:
+        response.headers["X-Memory-Peak-Bytes"] = str(measurement["peak_bytes"])
+    return response
+
+
+def overloaded(e: MemoryBudgetExceeded) -> HTTPException:
+    # Orçamento de memória esgotado: o cliente deve tentar novamente
+    return HTTPException(status_code=503, detail=e.message, headers={"Retry-After": "1"})
+
+
+def not_acceptable(e: NotAcceptableError) -> HTTPException:
+    return HTTPException(status_code=406, detail=e.message)
+
+
+# Formatos oferecidos pelos recursos tabulares (JSON por padrão, Arrow IPC sob demanda)
+TABULAR_MEDIA_TYPES = [JSON_MEDIA_TYPE, ARROW_MEDIA_TYPE]
+
 
 # Modelos Pydantic para entrada e saída
 class MatchSummaryRequest(BaseModel):
@@ -38,27 +83,126 @@ class NarrativeRequest(BaseModel):
 class NarrativeResponse(BaseModel):
     narrative: str
 
+class PlayerNotFoundError(Exception):
+    pass
+
+
+# Corpos serializados (bytes) dos recursos imutáveis de uma partida.
+# O trabalho pandas roda no pool de processos (workers.py). As rotas devolvem
+# esses bytes diretamente, então os modelos de resposta só documentam o schema
+# (responses=...) em vez de validar cada resposta (response_model=...).
+def match_summary_body(match_id: int) -> bytes:
+    return run_cpu_bound(get_main_events, match_id).encode()
+
+def player_profile_body(match_id: int, player_name: str) -> bytes:
+    profile_dict = json.loads(run_cpu_bound(get_player_profile, match_id, player_name))
+    if "error" in profile_dict:
+        raise PlayerNotFoundError(profile_dict["error"])
+    return dumps(profile_dict)
+
+
 # Endpoint: /match_summary
-@app.post("/match_summary", response_model=MatchSummaryResponse)
+@app.post("/match_summary", responses={200: {"model": MatchSummaryResponse}})
 def match_summary(request: MatchSummaryRequest):
     try:
-        events_json = get_main_events(request.match_id)
-        events_dict = json.loads(events_json)        
-        return events_dict
+        etag = make_etag("match_summary", request.match_id)
+        body = cached_body(etag, lambda: match_summary_body(request.match_id))
+        return Response(content=body, media_type="application/json")
+    except MemoryBudgetExceeded as e:
+        raise overloaded(e)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 # Endpoint: /player_profile
-@app.post("/player_profile", response_model=PlayerProfileResponse)
+@app.post("/player_profile", responses={200: {"model": PlayerProfileResponse}})
 def player_profile(request: PlayerProfileRequest):
     try:
-        # Chama a função para o perfil do jogador
-        profile_json = get_player_profile(request.match_id, request.player_name)
-        
-        # Transforma a string JSON em um dicionário Python
-        profile_dict = json.loads(profile_json)
-        
-        return profile_dict
+        etag = make_etag("player_profile", request.match_id, request.player_name)
+        body = cached_body(etag, lambda: player_profile_body(request.match_id, request.player_name))
+        return Response(content=body, media_type="application/json")
+    except MemoryBudgetExceeded as e:
+        raise overloaded(e)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# Endpoints GET cacheáveis (ETag + Cache-Control) para CDN / proxy reverso
+@app.get("/matches/{match_id}/summary", responses={200: {"model": MatchSummaryResponse}})
+def match_summary_resource(match_id: int, if_none_match: Optional[str] = Header(default=None)):
+    try:
+        etag = make_etag("match_summary", match_id)
+        return immutable_response(etag, if_none_match, lambda: match_summary_body(match_id))
+    except MemoryBudgetExceeded as e:
+        raise overloaded(e)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/matches/{match_id}/players/{player_name}/profile",
+         responses={200: {"model": PlayerProfileResponse}})
+def player_profile_resource(match_id: int, player_name: str,
+                            if_none_match: Optional[str] = Header(default=None)):
+    try:
+        etag = make_etag("player_profile", match_id, player_name)
+        return immutable_response(etag, if_none_match,
+                                  lambda: player_profile_body(match_id, player_name))
+    except PlayerNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except MemoryBudgetExceeded as e:
+        raise overloaded(e)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/matches/{match_id}/events")
+def match_events_resource(match_id: int, if_none_match: Optional[str] = Header(default=None),
+                          accept: Optional[str] = Header(default=None)):
+    try:
+        media_type = negotiate(accept, TABULAR_MEDIA_TYPES)
+        etag = make_etag("match_events", match_id, media_type)
+        if media_type == ARROW_MEDIA_TYPE:
+            compute = lambda: run_cpu_bound(get_events_arrow, match_id)
+        else:
+            compute = lambda: run_cpu_bound(get_events_json, match_id)
+        return immutable_response(etag, if_none_match, compute, media_type)
+    except NotAcceptableError as e:
+        raise not_acceptable(e)
+    except MemoryBudgetExceeded as e:
+        raise overloaded(e)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/matches/{match_id}/metrics")
+def match_metrics_resource(match_id: int, player_name: Optional[str] = None, table: str = "players",
+                           if_none_match: Optional[str] = Header(default=None),
+                           accept: Optional[str] = Header(default=None)):
+    try:
+        media_type = negotiate(accept, TABULAR_MEDIA_TYPES)
+        # Um stream Arrow carrega uma única tabela: "players" ou "teams"
+        if media_type == ARROW_MEDIA_TYPE:
+            etag = make_etag("match_metrics", match_id, player_name, media_type, table)
+            compute = lambda: run_cpu_bound(get_advanced_metrics_arrow, match_id, player_name, table)
+        else:
+            etag = make_etag("match_metrics", match_id, player_name, media_type)
+            compute = lambda: run_cpu_bound(get_advanced_metrics_json, match_id, player_name)
+        return immutable_response(etag, if_none_match, compute, media_type)
+    except NotAcceptableError as e:
+        raise not_acceptable(e)
+    except MemoryBudgetExceeded as e:
+        raise overloaded(e)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# Lista de partidas de uma temporada: muda enquanto a temporada está em andamento,
+# então não é tratada como recurso imutável
+@app.get("/competitions/{competition_id}/seasons/{season_id}/matches")
+def season_matches(competition_id: int, season_id: int):
+    try:
+        body = run_cpu_bound(get_matches, competition_id, season_id)
+        return Response(content=body, media_type=JSON_MEDIA_TYPE)
+    except MemoryBudgetExceeded as e:
+        raise overloaded(e)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -67,7 +211,7 @@ def player_profile(request: PlayerProfileRequest):
 def match_narrative(request: NarrativeRequest):
     try:
         # Obter os eventos principais da partida
-        events_json = get_main_events(request.match_id)
+        events_json = run_cpu_bound(get_main_events, request.match_id)
         events_dict = json.loads(events_json)
 
         # Gerar a narrativa
@@ -77,5 +221,18 @@ def match_narrative(request: NarrativeRequest):
         return narrative_dict
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
+    except MemoryBudgetExceeded as e:
+        raise overloaded(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+
+@app.get("/memory")
+def memory():
+    return {
+        "budget": budget.stats(),
+        "functions": memory_stats.snapshot(),
+        "shared_cache": shared_cache.stats(),
+        "process_peak_rss": process_peak_rss(),
+    }
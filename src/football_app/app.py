@@ -1,17 +1,19 @@
 from football_stats.competitions import get_competitions, get_matches
 from football_stats.matches import get_lineups, get_events, get_player_stats
-from langchain.memory import ConversationBufferMemory
 from langchain_community.chat_message_histories import StreamlitChatMessageHistory
 from langchain.schema import AIMessage, HumanMessage
 
 from langchain_community.callbacks.streamlit import StreamlitCallbackHandler
 from tools.football import get_sport_specialist_comments_about_match as comments_about_a_match
-from tools.football import generate_match_summary, get_player_profile_tool
+from tools.football import get_player_profile_tool
 from football_stats.matches import get_main_events, generate_narrative
-from tools import load_tools
+from tools import ToolSession
 import json
 
 from agent import load_agent
+from memory import build_memory
+from prefetch import MatchPrefetcher
+from router import answer_question, routing_stats
 
 import streamlit as st
 
@@ -23,14 +25,92 @@ msgs = StreamlitChatMessageHistory()
 
 
 if "memory" not in st.session_state:
-    st.session_state["memory"] = ConversationBufferMemory(messages=msgs, memory_key="chat_history", return_messages=True)
+    st.session_state["memory"] = build_memory(msgs)
 
 memory = st.session_state.memory
 
-def memorize_message():
-    user_input = st.session_state["user_input"]
-    st.session_state["memory"].chat_memory.add_message(HumanMessage(content=user_input))
-    
+# Tool observations are memoized for the whole conversation
+if "tool_session" not in st.session_state:
+    st.session_state["tool_session"] = ToolSession()
+
+# Match data and generated texts are prefetched in the background per session
+if "prefetcher" not in st.session_state:
+    st.session_state["prefetcher"] = MatchPrefetcher()
+
+prefetcher = st.session_state["prefetcher"]
+
+def render_chat_history():
+    """
+    Draw the conversation so far; only the agent prompt is bounded by the memory.
+
+    A Streamlit rerun removes every element it does not draw again, so the
+    transcript cannot be drawn once and then only appended to. The chat runs in
+    a fragment instead (see `chat`): a new message reruns the chat alone, not
+    the selectors, summary and commentary of the page.
+    """
+    for msg in st.session_state["memory"].chat_memory.messages:
+        if isinstance(msg, HumanMessage):
+            with st.chat_message("user"):
+                st.write(f"{msg.content}")
+        elif isinstance(msg, AIMessage):
+            with st.chat_message("assistant"):
+                st.write(f"{msg.content}")
+
+
+@st.fragment
+def chat(match_id, match_name, competition_id, season_id):
+    with st.container(border=False):
+        st.chat_input(key="user_input")
+        if user_input := st.session_state.user_input:
+            render_chat_history()
+            with st.chat_message("user"):
+                st.write(user_input)
+
+            with st.spinner("Agent is responding..."):
+                try:
+                    # Prepare input for the agent
+                    input_data = {
+                        "match_id": match_id,
+                        "match_name": match_name,
+                        "input": user_input,
+                        "agent_scratchpad": "",
+                        "competition_id": competition_id,
+                        "season_id": season_id,
+                    }
+
+                    # Debug: Print input to verify structure (optional)
+                    # st.write(f"Input to agent: {input_data}")
+
+                    try:
+                        # Answer structured questions directly, invoke the agent otherwise
+                        response = answer_question(
+                            input_data,
+                            agent_factory=lambda: load_agent(session=st.session_state["tool_session"]),
+                            chat_history=lambda: st.session_state["memory"].load_memory_variables({})["chat_history"],
+                        )
+                    finally:
+                        # Memorized once answered: the prompt gets the question through {input} only
+                        st.session_state["memory"].chat_memory.add_message(HumanMessage(content=user_input))
+
+                    # Validate response
+                    if isinstance(response, dict) and "output" in response:
+                        output = response.get("output")
+                    else:
+                        output = "Sorry, I couldn't understand your request. Please try again."
+
+                    # Add response to chat memory
+                    st.session_state["memory"].chat_memory.add_message(AIMessage(content=output))
+
+                    # Display response in chat
+                    with st.chat_message("assistant"):
+                        st.write(output)
+
+                except Exception as e:
+                    # Handle and display errors gracefully
+                    st.error(f"Error during agent execution: {str(e)}")
+                    st.write("Ensure that your inputs and agent configuration are correct.")
+
+
 def load_competitions():
     """
     Simulates loading competitions from your function.
@@ -94,7 +174,16 @@ if selected_season:
             None
         ) 
         match_id = match_details['match_id']
-        
+        prefetcher.start_match(match_id, match_details, selected_competition, selected_season)
+
+        # Warm the data of the neighbouring matches in the dropdown
+        position = match_names.index(selected_match)
+        neighbours = set(match_names[max(position - 1, 0):position + 2]) - {selected_match}
+        prefetcher.prefetch_neighbours(
+            match['match_id'] for match in matches
+            if f"{match['home_team']} vs {match['away_team']}" in neighbours
+        )
+
 # Main Page
 if not match_id:
     st.title("Football Match Conversation")
@@ -110,81 +199,28 @@ else:
     """,
     unsafe_allow_html=True)
     st.markdown(f'<h1 class="title">{selected_match}</h1><h3 class="title">{selected_competition} - Season {selected_season}</h3>', unsafe_allow_html=True)
-    with st.container(border=False):
-        st.chat_input(key="user_input", on_submit=memorize_message) 
-        if user_input := st.session_state.user_input:
-            chat_history = st.session_state["memory"].chat_memory.messages
-            for msg in chat_history:
-                if isinstance(msg, HumanMessage):
-                    with st.chat_message("user"):
-                        st.write(f"{msg.content}")
-                elif isinstance(msg, AIMessage):
-                    with st.chat_message("assistant"):
-                        st.write(f"{msg.content}")
-                        
-            with st.spinner("Agent is responding..."):
-                try:
-                    # Load agent
-                    agent = load_agent()
-                    
-                    # Cache tools to avoid redundant calls
-                    tools = load_tools()
-                    tool_names = [tool.name for tool in tools]
-                    tool_descriptions = [tool.description for tool in tools]
-
-                    # Prepare input for the agent
-                    input_data = {
-                        "match_id": match_id,
-                        "match_name": selected_match,
-                        "input": user_input,
-                        "agent_scratchpad": "",
-                        "competition_id": competition_id,
-                        "season_id": season_id,
-                        "tool_names": tool_names,
-                        "tools": tool_descriptions,
-                    }
-
-                    # Debug: Print input to verify structure (optional)
-                    # st.write(f"Input to agent: {input_data}")
+    chat(match_id, selected_match, competition_id, season_id)
 
-                    # Invoke agent
-                    response = agent.invoke(input=input_data, handle_parsing_errors=True)
+    # Questions answered without the agent, and the agent latency they avoided
+    with st.sidebar.expander("Chat Routing"):
+        stats = routing_stats.summary()
+        st.metric("Answered directly", stats["routed_total"])
+        st.metric("Answered by the agent", stats["agent_calls"])
+        if stats["estimated_seconds_avoided"] is not None:
+            st.metric("Agent time avoided (s)", stats["estimated_seconds_avoided"])
+        st.json(stats)
 
-                    # Validate response
-                    if isinstance(response, dict) and "output" in response:
-                        output = response.get("output")
-                    else:
-                        output = "Sorry, I couldn't understand your request. Please try again."
-
-                    # Add response to chat memory
-                    st.session_state["memory"].chat_memory.add_message(AIMessage(content=output))
-
-                    # Display response in chat
-                    with st.chat_message("assistant"):
-                        st.write(output)
-
-                except Exception as e:
-                    # Handle and display errors gracefully
-                    st.error(f"Error during agent execution: {str(e)}")
-                    st.write("Ensure that your inputs and agent configuration are correct.")
+if match_id:
+    # Match Summary Section
+    st.header("Match Summary")
+    with st.spinner("Generating match summary..."):
+        st.write(prefetcher.result("summary", match_id))
 
+    # Specialist Commentary Section
+    st.header("Specialist Commentary")
+    with st.spinner("Gathering specialist comments..."):
+        st.write(prefetcher.result("comments", match_id))
 
-# Match Summary Section
-st.header("Match Summary")
-with st.spinner("Generating match summary..."):
-    match_summary = generate_match_summary(
-        match_id=match_id,
-        match_details={
-            "home_team": match_details['home_team'],
-            "away_team": match_details['away_team'],
-            "competition": selected_competition,
-            "season": selected_season,
-            "score": f"{match_details.get('home_score', 'N/A')} - {match_details.get('away_score', 'N/A')}"
-        }
-    )
-    st.write(match_summary)
-
-if match_id:
     st.sidebar.header("Player Profile")
     player_name = st.sidebar.text_input("Enter the Player's Name")
 
@@ -1,13 +1,9 @@
 from statsbombpy import sb
 
-import json
+from .serialization import records_json
 
 def get_competitions() -> str:
-    return json.dumps(
-        sb.competitions().to_dict(orient='records')
-    )
+    return records_json(sb.competitions()).decode()
 
 def get_matches(competition_id: int, season_id: int) -> str:
-    return json.dumps(
-        sb.matches(competition_id=competition_id, season_id=season_id).to_dict(orient='records')
-    )
\ No newline at end of file
+    return records_json(sb.matches(competition_id=competition_id, season_id=season_id)).decode()
@@ -0,0 +1,184 @@
+import pandas as pd
+import numpy as np
+
+from statsbombpy import sb
+from typing import Dict, List, Optional
+
+from .matches import load_events
+from .memory_budget import BudgetedCache
+
+
+NESTED_FIELDS = ['cards', 'positions']
+FULL_TIME = 90.0
+
+_lineup_index_cache = BudgetedCache("lineup_index", max_entries=32)
+
+
+def _explode_records(lineup: pd.DataFrame, field: str) -> pd.DataFrame:
+    """
+    Turn a column holding lists of dicts into a flat table keyed by team and player.
+    """
+    exploded = (lineup[['team', 'player_id', field]]
+                .explode(field, ignore_index=True)
+                .dropna(subset=[field]))
+    records = pd.json_normalize(exploded[field].tolist())
+    keys = exploded[['team', 'player_id']].reset_index(drop=True)
+    return pd.concat([keys, records], axis=1)
+
+
+def _clock_to_minutes(clock: pd.Series) -> pd.Series:
+    """
+    Convert "MM:SS" clock strings into fractional minutes (NaN when missing).
+    """
+    parts = clock.astype('string').str.extract(r'^(\d+):(\d+)$').astype(float)
+    return parts[0] + parts[1] / 60
+
+
+def match_end_minute(events: pd.DataFrame) -> float:
+    """
+    Return the clock of the last event of a match, in fractional minutes.
+
+    The clock runs on through the periods, so a match that went to extra time
+    ends around 120 whatever its lineups recorded last. Penalty shootout kicks
+    are not played time and are left out.
+
+    Args:
+        events (pd.DataFrame): The events of the match, as returned by `sb.events`.
+
+    Returns:
+        float: The end of the match, never earlier than FULL_TIME.
+    """
+    if events.empty or 'minute' not in events.columns:
+        return FULL_TIME
+    played = events[events['period'] < 5] if 'period' in events.columns else events
+    clock = played['minute'] + played.get('second', 0) / 60
+    return max(FULL_TIME, float(clock.max())) if not clock.empty else FULL_TIME
+
+
+def normalize_lineups(lineups: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """
+    Normalize the StatsBomb lineups of a match into flat tables.
+
+    Args:
+        lineups (dict): Mapping of team name to lineup DataFrame, as returned by `sb.lineups`.
+
+    Returns:
+        dict: The "players", "positions" and "cards" tables, all keyed by team and player_id.
+    """
+    frames = [df.assign(team=team) for team, df in lineups.items()]
+    if not frames:
+        empty = pd.DataFrame(columns=['team', 'player_id'])
+        return {"players": empty, "positions": empty.copy(), "cards": empty.copy()}
+
+    lineup = pd.concat(frames, ignore_index=True)
+    return {
+        "players": lineup.drop(columns=NESTED_FIELDS, errors='ignore'),
+        "positions": _explode_records(lineup, 'positions'),
+        "cards": _explode_records(lineup, 'cards'),
+    }
+
+
+def build_lineup_index(tables: Dict[str, pd.DataFrame],
+                       match_end: Optional[float] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Build the lineup index of a match from its normalized tables.
+
+    The "players" table of the index carries, for every player, the first
+    position played, whether the player started or came off the bench and the
+    minutes spent on the pitch. Players are sorted by team and jersey number.
+
+    Args:
+        tables (dict): Normalized tables, as returned by `normalize_lineups`.
+        match_end (float): End of the match in minutes (see `match_end_minute`), closing
+            the stints still open at the final whistle. Defaults to the latest lineup
+            clock, but never earlier than FULL_TIME.
+
+    Returns:
+        dict: The "players", "positions" (one row per stint) and "cards" tables.
+    """
+    players = tables["players"]
+    positions = tables["positions"]
+
+    if positions.empty or 'from' not in positions.columns:
+        stints = pd.DataFrame(columns=['team', 'player_id', 'position', 'start_reason',
+                                       'start_minute', 'end_minute', 'minutes'])
+    else:
+        start = _clock_to_minutes(positions['from']).fillna(0.0)
+        end = _clock_to_minutes(positions['to'])
+        if match_end is None:
+            match_end = max(FULL_TIME, float(np.nanmax([start.max(), end.max()])))
+        end = end.fillna(match_end)
+        stints = positions.assign(start_minute=start,
+                                  end_minute=end,
+                                  minutes=(end - start).clip(lower=0))
+
+    minutes = stints.groupby(['team', 'player_id'], as_index=False)['minutes'].sum()
+    first_stint = (stints.sort_values(['team', 'player_id', 'start_minute'])
+                   .drop_duplicates(['team', 'player_id'])
+                   [['team', 'player_id', 'position', 'start_reason', 'start_minute']])
+
+    roster = (players
+              .merge(first_stint, on=['team', 'player_id'], how='left')
+              .merge(minutes, on=['team', 'player_id'], how='left'))
+    roster['minutes'] = roster['minutes'].fillna(0.0).astype(float)
+    roster['starter'] = roster['start_reason'].eq('Starting XI')
+    roster['substitute'] = roster['position'].notna() & ~roster['starter']
+    if 'jersey_number' in roster.columns:
+        roster = roster.sort_values(['team', 'jersey_number'], ignore_index=True)
+
+    return {"players": roster, "positions": stints, "cards": tables["cards"]}
+
+
+def get_lineup_index(match_id: int) -> Dict[str, pd.DataFrame]:
+    """
+    Return the cached lineup index of a match.
+
+    The index is computed once per match and kept in a cache charged to the
+    global memory budget; callers must not mutate the returned tables.
+
+    Args:
+        match_id (int): The ID of the match.
+
+    Returns:
+        dict: The lineup index, as returned by `build_lineup_index`.
+    """
+    return _lineup_index_cache.get_or_compute(
+        match_id, lambda: build_lineup_index(normalize_lineups(sb.lineups(match_id=match_id)),
+                                             match_end=match_end_minute(load_events(match_id)))
+    )
+
+
+def _players_by_team(players: pd.DataFrame) -> Dict[str, List[dict]]:
+    columns = ['player_name', 'position', 'jersey_number', 'minutes']
+    return {
+        team: group[columns].rename(columns={'player_name': 'player'}).to_dict(orient='records')
+        for team, group in players.groupby('team', sort=False)
+    }
+
+
+def get_starting_xi(match_id: int) -> Dict[str, List[dict]]:
+    """
+    Return the starting XI of both teams, sorted by jersey number.
+
+    Args:
+        match_id (int): The ID of the match.
+
+    Returns:
+        dict: Mapping of team name to its starters (player, position, jersey_number, minutes).
+    """
+    players = get_lineup_index(match_id)["players"]
+    return _players_by_team(players[players['starter']])
+
+
+def get_substitutes(match_id: int) -> Dict[str, List[dict]]:
+    """
+    Return the substitutes that came on for both teams, sorted by jersey number.
+
+    Args:
+        match_id (int): The ID of the match.
+
+    Returns:
+        dict: Mapping of team name to its substitutes (player, position, jersey_number, minutes).
+    """
+    players = get_lineup_index(match_id)["players"]
+    return _players_by_team(players[players['substitute']])
@@ -1,6 +1,5 @@
 import json
 import pandas as pd
-import numpy as np
 
 from copy import copy
 from statsbombpy import sb
@@ -11,6 +10,10 @@ from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
 from langchain_google_genai import GoogleGenerativeAI
 
+from . import shared_cache
+from .memory_budget import record_frame
+from .serialization import arrow_stream, dumps, records_json
+
 
 class PlayerStatsError(Exception):
     def __init__(self, message):
@@ -18,8 +21,8 @@ class PlayerStatsError(Exception):
         self.message = message
 
 
-def to_json(df: pd.DataFrame) -> str:
-    return json.dumps(df, indent=2)
+def to_json(data: dict) -> str:
+    return dumps(data).decode()
 
 
 
@@ -68,6 +71,48 @@ def generate_narrative(events: dict, style: str) -> str:
     return to_json({"narrative": narrative})
 
 
+def load_events(match_id: int) -> pd.DataFrame:
+    """
+    Load the events of a match (flattened attributes, as in `sb.events`)
+    through the cache shared by all worker processes.
+
+    Args:
+        match_id (int): The ID of the match.
+
+    Returns:
+        pd.DataFrame: All events of the match.
+    """
+    events = shared_cache.get_or_load(f"events-{match_id}", lambda: sb.events(match_id=match_id))
+    record_frame(events)
+    return events
+
+
+def load_sorted_events(match_id: int) -> pd.DataFrame:
+    """
+    Load the events of a match, with nested attributes, in chronological order.
+
+    Only the flattened events are kept in the shared cache; the responses
+    built from these are cached instead (see http_cache.py).
+    """
+    events = sb.events(match_id=match_id, flatten_attrs=False)
+    record_frame(events)
+    return events.sort_values(by="minute")
+
+
+def get_events_json(match_id: int) -> bytes:
+    """
+    Retrieve all events of a match as JSON, written column-wise from the
+    DataFrame; each event only carries the attributes it has.
+
+    Args:
+        match_id (int): The ID of the match.
+
+    Returns:
+        bytes: JSON array with all match events.
+    """
+    return records_json(load_sorted_events(match_id), drop_nulls=True)
+
+
 def get_events(match_id: int) -> str:
     """
     Retrieve all events of a match and format them in JSON.
@@ -78,12 +123,21 @@ def get_events(match_id: int) -> str:
     Returns:
         str: JSON string with all match events.
     """
-    events = sb.events(match_id=match_id, split=True, flatten_attrs=False)
-    full_events = pd.concat([v for _, v in events.items()])
-    return json.dumps([
-        {k: v for k, v in event.items() if v is not np.nan}
-        for event in full_events.sort_values(by="minute").to_dict(orient='records')
-    ])
+    return get_events_json(match_id).decode()
+
+
+def get_events_arrow(match_id: int) -> bytes:
+    """
+    Retrieve all events of a match as an Arrow IPC stream, built straight
+    from the DataFrame.
+
+    Args:
+        match_id (int): The ID of the match.
+
+    Returns:
+        bytes: Arrow IPC stream with one row per event.
+    """
+    return arrow_stream(load_sorted_events(match_id))
 
 
 def filter_main_events(events: pd.DataFrame) -> dict:
@@ -124,7 +178,7 @@ def get_main_events(match_id: int) -> str:
         str: JSON string with main events (goals, assists, and cards).
     """
     try: 
-        events = sb.events(match_id=match_id)
+        events = load_events(match_id)
         if isinstance(events, str):
             events = pd.DataFrame(json.loads(events))
         main_events = filter_main_events(events)
@@ -148,7 +202,7 @@ def get_player_stats(match_id: int, player_name: str) -> str:
     """
     try:
         # Load match events
-        events = sb.events(match_id=match_id)
+        events = load_events(match_id)
 
         # Validate if events were loaded
         if events.empty:
@@ -182,10 +236,10 @@ def get_player_stats(match_id: int, player_name: str) -> str:
             },
             "minutes_played": int(player_events['minute'].max())
         }
-        return json.dumps(profile)
+        return to_json(profile)
 
     except Exception as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
 
 
 def get_player_profile(match_id: int, player_name: str) -> str:
@@ -201,12 +255,12 @@ def get_player_profile(match_id: int, player_name: str) -> str:
     """
     try:
         # Carregar os eventos da partida
-        events = sb.events(match_id=match_id)
+        events = load_events(match_id)
 
         # Filtrar eventos do jogador específico
         player_events = events[events['player'] == player_name]
         if player_events.empty:
-            return json.dumps({"error": f"No events found for player: {player_name}"})
+            return to_json({"error": f"No events found for player: {player_name}"})
 
         # Consolidar estatísticas do jogador
         profile = {
@@ -222,10 +276,10 @@ def get_player_profile(match_id: int, player_name: str) -> str:
         }
 
         # Retornar o perfil em formato JSON
-        return json.dumps(profile)
+        return to_json(profile)
 
     except Exception as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     
 def get_lineups(match_id: int) -> str:
     """
@@ -238,5 +292,5 @@ def get_lineups(match_id: int) -> str:
         for key, df in data.items():
             df[field] = df[field].apply(lambda v: {field: v})
             data_final[key] = df.to_dict(orient='records')
-    return json.dumps(data_final)
+    return to_json(data_final)
 
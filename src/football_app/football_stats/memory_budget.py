@@ -0,0 +1,411 @@
+import contextvars
+import os
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional
+
+
+# Global budget of an API process: its match-data caches and in-flight requests,
+# the caches of its CPU pool processes and the shared cache files (see
+# MemoryBudget.register_external)
+MEMORY_BUDGET_BYTES = int(os.getenv("FOOTBALL_MEMORY_BUDGET_BYTES", str(1024 * 1024 * 1024)))
+# How long a request waits for memory before being shed
+MEMORY_QUEUE_TIMEOUT = float(os.getenv("FOOTBALL_MEMORY_QUEUE_TIMEOUT", "10"))
+# Reservation of a request whose peak has not been measured yet
+DEFAULT_REQUEST_BYTES = int(os.getenv("FOOTBALL_REQUEST_BYTES_ESTIMATE", str(128 * 1024 * 1024)))
+# tracemalloc slows allocations down, so peak measurement is opt-in
+MEMORY_TRACKING = os.getenv("FOOTBALL_MEMORY_TRACKING", "0") == "1"
+
+
+class MemoryBudgetExceeded(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+
+def frame_bytes(frame: Any, deep: bool = True) -> int:
+    """
+    Return the memory usage of a DataFrame (or of a dict of DataFrames).
+
+    The deep usage walks every Python object of the object columns; the
+    shallow one only counts their pointers and is close to free.
+    """
+    if isinstance(frame, pd.DataFrame):
+        return int(frame.memory_usage(deep=deep).sum())
+    if isinstance(frame, dict):
+        return sum(frame_bytes(v, deep) for v in frame.values())
+    if isinstance(frame, (bytes, str)):
+        return len(frame)
+    return 0
+
+
+class MemoryBudget:
+    """
+    Byte budget shared by the caches and the requests of the process.
+
+    Caches charge what they keep with `try_charge` and are asked to evict when
+    a request needs memory; requests `reserve` their expected peak and wait
+    (back-pressure) or are shed with MemoryBudgetExceeded when the budget
+    cannot be freed in time.
+
+    Memory held outside the caches of the process (the shared cache files,
+    the caches of the pool processes) is counted through `register_external`.
+    """
+
+    def __init__(self, limit: int = MEMORY_BUDGET_BYTES, timeout: float = MEMORY_QUEUE_TIMEOUT):
+        self.limit = limit
+        self.timeout = timeout
+        self.used = 0
+        self.peak = 0
+        self.reserved = 0
+        self.waiting = 0
+        self.queued = 0
+        self.shed = 0
+        self._caches: List["BudgetedCache"] = []
+        self._external: Dict[str, tuple] = {}
+        self._condition = threading.Condition()
+
+    def register(self, cache: "BudgetedCache") -> None:
+        self._caches.append(cache)
+
+    def unregister(self, cache: "BudgetedCache") -> None:
+        if cache in self._caches:
+            self._caches.remove(cache)
+
+    def register_external(self, name: str, usage: Callable[[], int],
+                          reclaim: Optional[Callable[[int], int]] = None) -> None:
+        """
+        Count memory held outside the caches of this process.
+
+        Args:
+            name (str): Name reported in `stats`.
+            usage (callable): Returns the bytes currently held; must be cheap.
+            reclaim (callable): Frees up to the given bytes and returns how many were freed (optional).
+        """
+        self._external[name] = (usage, reclaim)
+
+    def restrict(self, limit: int) -> None:
+        """
+        Turn this budget into the private cache budget of a pool process: the
+        external memory is accounted by the API process that owns the pool.
+        """
+        with self._condition:
+            self.limit = limit
+            self._external.clear()
+
+    def _external_bytes(self) -> int:
+        return sum(usage() for usage, _ in self._external.values())
+
+    def _fits(self, nbytes: int) -> bool:
+        return self.used + self._external_bytes() + nbytes <= self.limit
+
+    def _charge(self, nbytes: int) -> None:
+        self.used += nbytes
+        self.peak = max(self.peak, self.used)
+
+    def try_charge(self, nbytes: int) -> bool:
+        with self._condition:
+            if not self._fits(nbytes):
+                return False
+            self._charge(nbytes)
+            return True
+
+    def release(self, nbytes: int) -> None:
+        with self._condition:
+            self.used -= nbytes
+            self._condition.notify_all()
+
+    def _reclaim(self, nbytes: int) -> None:
+        # Called without holding the budget lock (caches call `release`).
+        # Only the shortfall is evicted, local caches first.
+        with self._condition:
+            shortfall = self.used + self._external_bytes() + nbytes - self.limit
+        reclaimers = [cache.evict_bytes for cache in self._caches]
+        reclaimers += [reclaim for _, reclaim in self._external.values() if reclaim is not None]
+        for reclaim in reclaimers:
+            if shortfall <= 0:
+                return
+            shortfall -= reclaim(shortfall)
+
+    def reserve(self, nbytes: int, timeout: Optional[float] = None) -> None:
+        """
+        Reserve memory for a request, evicting cached data and then waiting
+        for other requests if needed.
+
+        Raises:
+            MemoryBudgetExceeded: When the memory could not be reserved in time.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        if nbytes > self.limit:
+            with self._condition:
+                self.shed += 1
+            raise MemoryBudgetExceeded(f"Request needs {nbytes} bytes, above the memory budget.")
+        if self.try_charge(nbytes):
+            with self._condition:
+                self.reserved += nbytes
+            return
+
+        self._reclaim(nbytes)
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            self.waiting += 1
+            self.queued += 1
+            try:
+                while not self._fits(nbytes):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.shed += 1
+                        raise MemoryBudgetExceeded("Memory budget exhausted, try again later.")
+                    # External memory changes without notification: poll it
+                    self._condition.wait(min(remaining, 0.5))
+                self._charge(nbytes)
+                self.reserved += nbytes
+            finally:
+                self.waiting -= 1
+
+    @contextmanager
+    def reservation(self, nbytes: int) -> Iterator[None]:
+        self.reserve(nbytes)
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.reserved -= nbytes
+            self.release(nbytes)
+
+    def stats(self) -> dict:
+        with self._condition:
+            stats = {"limit": self.limit, "used": self.used, "peak": self.peak,
+                     "reserved_by_requests": self.reserved, "waiting": self.waiting,
+                     "queued": self.queued, "shed": self.shed}
+        stats["caches"] = {cache.name: cache.stats() for cache in self._caches}
+        stats["external"] = {name: usage() for name, (usage, _) in self._external.items()}
+        return stats
+
+
+budget = MemoryBudget()
+
+
+class BudgetedCache:
+    """
+    LRU cache whose entries are charged to the global memory budget.
+
+    Entries that do not fit are not cached, and the least recently used
+    entries are evicted when the budget needs room.
+    """
+
+    def __init__(self, name: str, max_bytes: Optional[int] = None, max_entries: Optional[int] = None,
+                 sizeof: Callable[[Any], int] = frame_bytes, memory_budget: MemoryBudget = budget):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._sizeof = sizeof
+        self._budget = memory_budget
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        memory_budget.register(self)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def _over_limits(self, extra_bytes: int = 0, extra_entries: int = 0) -> bool:
+        return ((self.max_bytes is not None and self.size + extra_bytes > self.max_bytes)
+                or (self.max_entries is not None
+                    and len(self._entries) + extra_entries > self.max_entries))
+
+    def _evict_one(self) -> Optional[int]:
+        """
+        Evict the least recently used entry and return its size (None when empty).
+        """
+        with self._lock:
+            if not self._entries:
+                return None
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self.size -= nbytes
+        self._budget.release(nbytes)
+        return nbytes
+
+    def evict_bytes(self, nbytes: int) -> int:
+        """
+        Evict least recently used entries until `nbytes` are freed (or the cache is empty).
+        """
+        freed = 0
+        while freed < nbytes:
+            evicted = self._evict_one()
+            if evicted is None:
+                break
+            freed += evicted
+        return freed
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.size -= entry[1]
+        if entry is not None:
+            self._budget.release(entry[1])
+
+    def put(self, key: Hashable, value: Any) -> None:
+        nbytes = self._sizeof(value)
+        if self.max_bytes is not None and (nbytes > self.max_bytes or self.max_bytes == 0):
+            return
+        self.pop(key)
+        while True:
+            with self._lock:
+                fits = not self._over_limits(nbytes, 1)
+            if fits:
+                break
+            if self._evict_one() is None:
+                return
+        while not self._budget.try_charge(nbytes):
+            if self._evict_one() is None:
+                return
+        with self._lock:
+            self._entries[key] = (value, nbytes)
+            self.size += nbytes
+
+    def clear(self) -> None:
+        while self._evict_one() is not None:
+            pass
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self.size, "max_bytes": self.max_bytes,
+                    "max_entries": self.max_entries, "hits": self.hits, "misses": self.misses}
+
+
+class MemoryStats:
+    """
+    Per-name (function or route) memory measurements: traced peak and DataFrame bytes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, dict] = {}
+
+    def record(self, name: str, peak_bytes: Optional[int] = None, frames_bytes: int = 0) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(name, {"calls": 0, "max_peak_bytes": None,
+                                                  "last_peak_bytes": None,
+                                                  "max_frame_bytes": 0, "total_frame_bytes": 0})
+            stats["calls"] += 1
+            if peak_bytes is not None:
+                stats["last_peak_bytes"] = peak_bytes
+                stats["max_peak_bytes"] = max(stats["max_peak_bytes"] or 0, peak_bytes)
+            stats["max_frame_bytes"] = max(stats["max_frame_bytes"], frames_bytes)
+            stats["total_frame_bytes"] += frames_bytes
+
+    def estimate(self, name: str) -> Optional[int]:
+        """
+        Return the largest memory footprint seen for `name`, if any.
+        """
+        with self._lock:
+            stats = self._stats.get(name)
+            if not stats:
+                return None
+            return max(stats["max_peak_bytes"] or 0, stats["max_frame_bytes"]) or None
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._stats.items()}
+
+
+memory_stats = MemoryStats()
+
+# Innermost running measurement; context variables follow requests into the
+# threadpool and tasks FastAPI runs them in.
+_current_measurement = contextvars.ContextVar("current_measurement", default=None)
+
+
+def record_frame(frame: Any) -> None:
+    """
+    Account the DataFrame bytes loaded by the running measurement.
+
+    Every request is measured, so only the shallow size is recorded (a deep
+    scan of the events more than doubled the time of a match summary); the
+    deep size is recorded when FOOTBALL_MEMORY_TRACKING is on.
+    """
+    current = _current_measurement.get()
+    if current is not None:
+        current["frame_bytes"] += frame_bytes(frame, deep=MEMORY_TRACKING)
+
+
+def record_child(measurement: dict) -> None:
+    """
+    Account a measurement taken in another process (e.g. the CPU pool) to the
+    running measurement and to the per-function statistics.
+    """
+    memory_stats.record(measurement["name"], measurement["peak_bytes"], measurement["frame_bytes"])
+    current = _current_measurement.get()
+    if current is not None:
+        current["frame_bytes"] += measurement["frame_bytes"]
+        current["child_peak_bytes"] = max(current["child_peak_bytes"],
+                                          measurement["peak_bytes"] or 0)
+
+
+@contextmanager
+def measure(name: str, stats: Optional[MemoryStats] = memory_stats) -> Iterator[dict]:
+    """
+    Measure the memory of a block: the DataFrame bytes it loads and, when
+    FOOTBALL_MEMORY_TRACKING is on, its traced peak allocation.
+
+    The peak is exact in the CPU pool processes (one task at a time) and
+    approximate for concurrent blocks in the same process.
+    """
+    measurement = {"name": name, "peak_bytes": None, "frame_bytes": 0, "child_peak_bytes": 0}
+    previous = _current_measurement.get()
+    token = _current_measurement.set(measurement)
+    if MEMORY_TRACKING:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+    try:
+        yield measurement
+    finally:
+        if MEMORY_TRACKING:
+            _, peak = tracemalloc.get_traced_memory()
+            measurement["peak_bytes"] = max(peak - start, measurement["child_peak_bytes"], 0)
+        _current_measurement.reset(token)
+        if previous is not None:
+            previous["frame_bytes"] += measurement["frame_bytes"]
+            previous["child_peak_bytes"] = max(previous["child_peak_bytes"],
+                                               measurement["peak_bytes"] or 0)
+        if stats is not None:
+            stats.record(name, measurement["peak_bytes"], measurement["frame_bytes"])
+
+
+def process_peak_rss() -> Optional[int]:
+    """
+    Return the peak resident set size of the process in bytes (None where unsupported).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
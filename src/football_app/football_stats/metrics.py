@@ -0,0 +1,211 @@
+import numpy as np
+import pandas as pd
+
+from typing import Callable, Dict, Optional
+
+from .matches import load_events
+from .memory_budget import BudgetedCache
+from .serialization import arrow_stream, dumps
+
+
+# StatsBomb pitch: 120 x 80 yards, attacking left to right
+GOAL_X, GOAL_Y = 120.0, 40.0
+FINAL_THIRD_X = 80.0
+# A pass or carry is progressive when it brings the ball at least 25% closer
+# to the goal and does not start in the team's own defensive 40%.
+PROGRESSIVE_RATIO = 0.75
+PROGRESSIVE_MIN_X = 48.0
+DUEL_WON_OUTCOMES = ['Won', 'Success In Play', 'Success Out']
+# Penalty shootout kicks are not match shots: they count neither as shots, goals nor xG
+SHOOTOUT_PERIOD = 5
+
+_metrics_cache = BudgetedCache("match_metrics", max_entries=64)
+
+
+def _coordinate(events: pd.DataFrame, column: str, axis: int) -> np.ndarray:
+    if column not in events.columns or events[column].dtype != object:
+        return np.full(len(events), np.nan)
+    return pd.to_numeric(events[column].str[axis], errors='coerce').to_numpy(dtype=float)
+
+
+def _column(events: pd.DataFrame, column: str) -> np.ndarray:
+    if column not in events.columns:
+        return np.full(len(events), None, dtype=object)
+    return events[column].to_numpy(dtype=object)
+
+
+def extract_columns(events: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Extract, once, the numpy arrays every metric is computed from.
+    """
+    is_pass = (events['type'] == 'Pass').to_numpy()
+    in_shootout = ((events['period'] == SHOOTOUT_PERIOD).to_numpy()
+                   if 'period' in events.columns else np.zeros(len(events), dtype=bool))
+    is_carry = (events['type'] == 'Carry').to_numpy()
+    end_x = np.where(is_pass, _coordinate(events, 'pass_end_location', 0),
+                     _coordinate(events, 'carry_end_location', 0))
+    end_y = np.where(is_pass, _coordinate(events, 'pass_end_location', 1),
+                     _coordinate(events, 'carry_end_location', 1))
+    xg = (pd.to_numeric(events['shot_statsbomb_xg'], errors='coerce').fillna(0).to_numpy(dtype=float)
+          if 'shot_statsbomb_xg' in events.columns else np.zeros(len(events)))
+    pass_outcome = _column(events, 'pass_outcome')
+    return {
+        "type": events['type'].to_numpy(dtype=object),
+        "is_shot": (events['type'] == 'Shot').to_numpy() & ~in_shootout,
+        "is_pass": is_pass,
+        "is_carry": is_carry,
+        "pass_completed": is_pass & pd.isna(pass_outcome),
+        "x": _coordinate(events, 'location', 0),
+        "y": _coordinate(events, 'location', 1),
+        "end_x": end_x,
+        "end_y": end_y,
+        "xg": xg,
+        "shot_outcome": _column(events, 'shot_outcome'),
+        "duel_outcome": _column(events, 'duel_outcome'),
+    }
+
+
+def _goal_distance(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    return np.hypot(GOAL_X - x, GOAL_Y - y)
+
+
+def _progressive(c: Dict[str, np.ndarray]) -> np.ndarray:
+    with np.errstate(invalid='ignore'):
+        return ((_goal_distance(c["end_x"], c["end_y"])
+                 <= PROGRESSIVE_RATIO * _goal_distance(c["x"], c["y"]))
+                & (c["x"] >= PROGRESSIVE_MIN_X))
+
+
+def _final_third_entry(c: Dict[str, np.ndarray]) -> np.ndarray:
+    with np.errstate(invalid='ignore'):
+        return (c["x"] < FINAL_THIRD_X) & (c["end_x"] >= FINAL_THIRD_X)
+
+
+# Each metric is a vectorized expression over the extracted arrays, returning
+# the contribution of every event. New metrics only add an entry here: all of
+# them are aggregated together in a single grouped reduction.
+METRICS: Dict[str, Callable[[Dict[str, np.ndarray]], np.ndarray]] = {
+    "shots": lambda c: c["is_shot"],
+    "goals": lambda c: c["is_shot"] & (c["shot_outcome"] == 'Goal'),
+    "xg": lambda c: np.where(c["is_shot"], c["xg"], 0.0),
+    "passes": lambda c: c["is_pass"],
+    "passes_completed": lambda c: c["pass_completed"],
+    "progressive_passes": lambda c: c["pass_completed"] & _progressive(c),
+    "carries": lambda c: c["is_carry"],
+    "progressive_carries": lambda c: c["is_carry"] & _progressive(c),
+    "final_third_entries": lambda c: (c["pass_completed"] | c["is_carry"]) & _final_third_entry(c),
+    "pressures": lambda c: c["type"] == 'Pressure',
+    "duels": lambda c: c["type"] == 'Duel',
+    "duels_won": lambda c: (c["type"] == 'Duel') & np.isin(c["duel_outcome"], DUEL_WON_OUTCOMES),
+}
+
+COUNT_METRICS = [name for name in METRICS if name != "xg"]
+
+
+def _add_ratios(totals: pd.DataFrame) -> pd.DataFrame:
+    totals['xg_per_shot'] = (totals['xg'] / totals['shots'].replace(0, np.nan)).fillna(0.0)
+    totals['pass_completion'] = (totals['passes_completed']
+                                 / totals['passes'].replace(0, np.nan)).fillna(0.0)
+    return totals.round({'xg': 3, 'xg_per_shot': 3, 'pass_completion': 3})
+
+
+def compute_match_metrics(events: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Compute the advanced metrics of every player and team of a match.
+
+    The event frame is read once into numpy arrays; every metric is a
+    vectorized expression over those arrays, and all metrics are summed per
+    player in one grouped reduction.
+
+    Args:
+        events (pd.DataFrame): Flattened events of a match, as returned by `sb.events`.
+
+    Returns:
+        dict: The "players" and "teams" metric tables.
+    """
+    if 'player' not in events.columns:
+        events = events.assign(player=None)
+    events = events[events['player'].notna()]
+    columns = extract_columns(events)
+    contributions = np.zeros((len(events), len(METRICS)))
+    for i, metric in enumerate(METRICS.values()):
+        contributions[:, i] = metric(columns)
+
+    players = (pd.DataFrame(contributions, columns=list(METRICS))
+               .groupby([events['team'].to_numpy(), events['player'].to_numpy()])
+               .sum())
+    players.index.names = ['team', 'player']
+    players[COUNT_METRICS] = players[COUNT_METRICS].astype(int)
+    teams = players.groupby(level='team').sum()
+
+    players = _add_ratios(players).reset_index().sort_values(['team', 'xg'], ascending=[True, False],
+                                                             ignore_index=True)
+    teams = _add_ratios(teams).reset_index()
+    return {"players": players, "teams": teams}
+
+
+def get_match_metrics(match_id: int) -> Dict[str, pd.DataFrame]:
+    """
+    Return the advanced metrics of a match, computed once and cached per match.
+
+    Args:
+        match_id (int): The ID of the match.
+
+    Returns:
+        dict: The "players" and "teams" metric tables.
+    """
+    return _metrics_cache.get_or_compute(match_id,
+                                         lambda: compute_match_metrics(load_events(match_id)))
+
+
+def _filter_players(players: pd.DataFrame, player_name: Optional[str]) -> pd.DataFrame:
+    if player_name:
+        players = players[players['player'].str.contains(player_name, case=False, regex=False)]
+    return players
+
+
+def get_advanced_metrics_json(match_id: int, player_name: Optional[str] = None) -> bytes:
+    """
+    Retrieve the advanced metrics of a match as JSON bytes (see `get_advanced_metrics`).
+    """
+    metrics = get_match_metrics(match_id)
+    return dumps({
+        "teams": metrics["teams"],
+        "players": _filter_players(metrics["players"], player_name),
+    })
+
+
+def get_advanced_metrics(match_id: int, player_name: Optional[str] = None) -> str:
+    """
+    Retrieve the advanced metrics (xG, progressive actions, final-third entries,
+    pressures, duels) of a match in JSON.
+
+    Args:
+        match_id (int): The ID of the match.
+        player_name (str): Restrict the player metrics to players whose name contains it (optional).
+
+    Returns:
+        str: JSON string with the "teams" and "players" metrics.
+    """
+    return get_advanced_metrics_json(match_id, player_name).decode()
+
+
+def get_advanced_metrics_arrow(match_id: int, player_name: Optional[str] = None,
+                               table: str = "players") -> bytes:
+    """
+    Retrieve one advanced metrics table of a match as an Arrow IPC stream.
+
+    Args:
+        match_id (int): The ID of the match.
+        player_name (str): Restrict the player metrics to players whose name contains it (optional).
+        table (str): "players" or "teams".
+
+    Returns:
+        bytes: Arrow IPC stream with one row per player or team.
+    """
+    if table not in ("players", "teams"):
+        raise ValueError(f"Unknown metrics table '{table}'. Choose from: players, teams.")
+    metrics = get_match_metrics(match_id)
+    if table == "teams":
+        return arrow_stream(metrics["teams"])
+    return arrow_stream(_filter_players(metrics["players"], player_name))
@@ -0,0 +1,186 @@
+import math
+import re
+
+import orjson
+import pandas as pd
+import pyarrow as pa
+
+from typing import Optional, Sequence
+
+
+JSON_MEDIA_TYPE = "application/json"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+JSON_COLUMNS_METADATA = b"json_columns"
+
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# A member whose value is null and follows another member, in the compact
+# output of DataFrame.to_json. Quotes inside strings are always escaped there,
+# so ',"' only ever starts an object key.
+_NULL_MEMBER = re.compile(rb',"[^"\\]*":null(?=[,}])')
+
+
+class NotAcceptableError(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+
+def records_json(df: pd.DataFrame, drop_nulls: bool = False) -> bytes:
+    """
+    Serialize a DataFrame as a JSON array of records, without building a dict per row.
+
+    Missing values become null, or are left out of their record with
+    `drop_nulls` (sparse frames such as events, where most attribute columns
+    are missing from most rows). Null members of nested objects are dropped
+    too, unless they come first in their object.
+    """
+    body = df.to_json(orient='records', date_format='iso', double_precision=15,
+                      default_handler=str).encode()
+    if drop_nulls and len(df.columns):
+        body = _NULL_MEMBER.sub(b"", body)
+        first = b"{" + orjson.dumps(str(df.columns[0])) + b":null"
+        body = body.replace(first + b",", b"{").replace(first + b"}", b"{}")
+    return body
+
+
+def _default(obj):
+    if isinstance(obj, pd.DataFrame):
+        # Embedded as is in the surrounding document
+        return orjson.Fragment(records_json(obj))
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    if obj is pd.NA or obj is pd.NaT:
+        return None
+    return str(obj)
+
+
+def dumps(data) -> bytes:
+    """
+    Serialize `data` to compact JSON with orjson.
+
+    Numpy scalars and arrays are supported, DataFrames are written as arrays
+    of records and NaN becomes null.
+
+    Args:
+        data: The data to serialize.
+
+    Returns:
+        bytes: The UTF-8 encoded JSON document.
+    """
+    return orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS)
+
+
+def _is_missing(value) -> bool:
+    return value is None or value is pd.NA or value is pd.NaT or (
+        isinstance(value, float) and math.isnan(value))
+
+
+def to_arrow_table(df: pd.DataFrame) -> pa.Table:
+    """
+    Convert a DataFrame to an Arrow table, column by column.
+
+    Numeric columns are converted without copying row by row; object columns
+    holding nested StatsBomb attributes become Arrow lists and structs. Columns
+    whose values have no common Arrow type are shipped as JSON text and listed
+    in the "json_columns" schema metadata.
+    """
+    columns, json_columns = {}, []
+    for name, column in df.items():
+        try:
+            columns[str(name)] = pa.array(column, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            columns[str(name)] = pa.array(
+                [None if _is_missing(v) else dumps(v).decode() for v in column], type=pa.string())
+            json_columns.append(str(name))
+    return pa.table(columns, metadata={JSON_COLUMNS_METADATA: dumps(json_columns)})
+
+
+def arrow_to_frame(table: pa.Table) -> pd.DataFrame:
+    """
+    Convert an Arrow table built by `to_arrow_table` back to a DataFrame,
+    decoding the columns stored as JSON text.
+
+    Numeric columns stay views of the table buffers when they have no nulls.
+    """
+    frame = table.to_pandas(split_blocks=True)
+    metadata = table.schema.metadata or {}
+    for name in orjson.loads(metadata.get(JSON_COLUMNS_METADATA, b"[]")):
+        frame[name] = frame[name].map(lambda v: orjson.loads(v) if v is not None else None)
+    return frame
+
+
+def arrow_stream(df: pd.DataFrame) -> bytes:
+    """
+    Serialize a DataFrame as an Arrow IPC stream.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to serialize (the index is dropped).
+
+    Returns:
+        bytes: The IPC stream, readable with `pyarrow.ipc.open_stream`.
+    """
+    table = to_arrow_table(df)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _parse_accept(accept: str) -> list:
+    ranges = []
+    for item in accept.split(","):
+        media_range, *params = [part.strip() for part in item.split(";")]
+        if not media_range:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        ranges.append((media_range.lower(), quality))
+    return ranges
+
+
+def _quality(media_type: str, ranges: list) -> float:
+    main_type = media_type.split("/")[0]
+    best, specificity = 0.0, -1
+    for media_range, quality in ranges:
+        if media_range == media_type:
+            match = 2
+        elif media_range == f"{main_type}/*":
+            match = 1
+        elif media_range == "*/*":
+            match = 0
+        else:
+            continue
+        if match > specificity:
+            best, specificity = quality, match
+    return best
+
+
+def negotiate(accept: Optional[str], offers: Sequence[str]) -> str:
+    """
+    Pick the media type to answer with from an Accept header.
+
+    Args:
+        accept (str): The Accept header (missing means anything is accepted).
+        offers (list): The media types available, preferred first.
+
+    Returns:
+        str: The offer with the highest quality; ties go to the earliest offer.
+
+    Raises:
+        NotAcceptableError: When the client accepts none of the offers.
+    """
+    ranges = _parse_accept(accept or "")
+    if not ranges:
+        return offers[0]
+    qualities = [_quality(offer, ranges) for offer in offers]
+    best = max(range(len(offers)), key=lambda i: (qualities[i], -i))
+    if qualities[best] <= 0:
+        raise NotAcceptableError(f"Acceptable media types: {', '.join(offers)}.")
+    return offers[best]
@@ -0,0 +1,181 @@
+import hashlib
+import os
+import stat
+import tempfile
+import threading
+import time
+
+import pandas as pd
+import pyarrow as pa
+
+from typing import Callable, Optional
+
+from .memory_budget import budget
+from .serialization import arrow_to_frame, to_arrow_table
+
+
+def _default_cache_dir() -> str:
+    # /dev/shm is memory-backed on Linux, so cached matches never touch the disk
+    root = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(root, f"football_insights-{os.getuid()}")
+
+
+SHARED_CACHE_DIR = os.getenv("FOOTBALL_SHARED_CACHE_DIR", _default_cache_dir())
+SHARED_CACHE_MAX_BYTES = int(os.getenv("FOOTBALL_SHARED_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+# How long the measured size of the cache directory is reused
+USAGE_REFRESH_SECONDS = 1.0
+
+_usage_lock = threading.Lock()
+_usage = {"bytes": 0, "measured_at": 0.0}
+
+
+def _path(key: str) -> str:
+    name = hashlib.sha1(key.encode()).hexdigest()
+    return os.path.join(SHARED_CACHE_DIR, f"{name}.arrow")
+
+
+def _usable_dir() -> bool:
+    """
+    Create the cache directory, private to the current user, and refuse to
+    use one that somebody else owns or can write to.
+    """
+    os.makedirs(SHARED_CACHE_DIR, mode=0o700, exist_ok=True)
+    info = os.stat(SHARED_CACHE_DIR)
+    return info.st_uid == os.getuid() and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def _read(path: str) -> pd.DataFrame:
+    with pa.memory_map(path, "r") as source:
+        # Zero-copy: the table buffers are pages of the file, shared by every process
+        table = pa.ipc.open_file(source).read_all()
+    # Mark as recently used for the LRU eviction
+    os.utime(path)
+    return arrow_to_frame(table)
+
+
+def _write(path: str, frame: pd.DataFrame) -> None:
+    table = to_arrow_table(frame)
+    fd, tmp_path = tempfile.mkstemp(dir=SHARED_CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f, pa.ipc.new_file(f, table.schema) as writer:
+            writer.write_table(table)
+        # Atomic: concurrent readers in other workers see either nothing or the whole file
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    evict()
+
+
+def _entries() -> list:
+    try:
+        return [e for e in os.scandir(SHARED_CACHE_DIR) if e.name.endswith(".arrow")]
+    except FileNotFoundError:
+        return []
+
+
+def _sizes() -> list:
+    sizes = []
+    for entry in _entries():
+        try:
+            info = entry.stat()
+        except FileNotFoundError:
+            continue
+        sizes.append((info.st_mtime, info.st_size, entry.path))
+    return sizes
+
+
+def _measured(total: int) -> int:
+    with _usage_lock:
+        _usage["bytes"], _usage["measured_at"] = total, time.monotonic()
+    return total
+
+
+def usage() -> int:
+    """
+    Bytes held by the cache files (tmpfs pages count against the memory of
+    the machine or container). Re-measured at most every USAGE_REFRESH_SECONDS.
+    """
+    with _usage_lock:
+        if time.monotonic() - _usage["measured_at"] < USAGE_REFRESH_SECONDS:
+            return _usage["bytes"]
+    return _measured(sum(size for _, size, _ in _sizes()))
+
+
+def evict(max_bytes: Optional[int] = None) -> int:
+    """
+    Remove the least recently used entries until the cache fits in `max_bytes`.
+
+    Returns:
+        int: The bytes freed.
+    """
+    max_bytes = SHARED_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    stats = sorted(_sizes())
+    total = sum(size for _, size, _ in stats)
+    freed = 0
+    for _, size, path in stats:
+        if total - freed <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+            freed += size
+        except FileNotFoundError:
+            pass
+    _measured(total - freed)
+    return freed
+
+
+def reclaim(nbytes: int) -> int:
+    """
+    Free at least `nbytes` of cache files (when there are that many).
+    """
+    return evict(max(usage() - nbytes, 0))
+
+
+# The cache files are charged to the memory budget of every API process, which
+# may evict them when a request needs room
+budget.register_external("shared_cache", usage, reclaim)
+
+
+def get_or_load(key: str, loader: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    """
+    Return the frame cached under `key`, loading and storing it on a miss.
+
+    Entries are Arrow IPC files in SHARED_CACHE_DIR, shared by every process
+    of the machine (API workers and the CPU pool). A match is fetched and
+    parsed once; readers memory-map the file, so its numeric columns are the
+    same physical pages in every process. String and nested columns still
+    become Python objects in each reader.
+
+    Args:
+        key (str): Identifier of the cached frame.
+        loader (callable): Builds the frame on a miss.
+
+    Returns:
+        pd.DataFrame: The cached frame.
+    """
+    try:
+        usable = _usable_dir()
+    except OSError:
+        usable = False
+    if not usable:
+        return loader()
+
+    path = _path(key)
+    try:
+        return _read(path)
+    except (FileNotFoundError, pa.ArrowInvalid):
+        pass
+    frame = loader()
+    try:
+        _write(path, frame)
+    except (OSError, pa.ArrowException):
+        # The cache is an optimization; a full or read-only directory must not fail the request
+        pass
+    return frame
+
+
+def stats() -> dict:
+    sizes = _sizes()
+    return {"directory": SHARED_CACHE_DIR, "entries": len(sizes),
+            "bytes": _measured(sum(size for _, size, _ in sizes)), "max_bytes": SHARED_CACHE_MAX_BYTES}
@@ -0,0 +1,415 @@
+import argparse
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from contextlib import contextmanager
+from statsbombpy import sb
+from typing import Iterator, List, Optional
+
+from .lineups import get_lineup_index
+from .serialization import records_json
+
+
+STORE_PATH = os.getenv("FOOTBALL_STORE_PATH", "football_insights.db")
+
+EVENT_COLUMNS = [
+    'id', 'match_id', 'index', 'period', 'minute', 'second', 'team', 'player',
+    'position', 'type', 'play_pattern', 'possession', 'possession_team',
+    'location_x', 'location_y', 'under_pressure',
+    'pass_outcome', 'pass_length', 'pass_end_location_x', 'pass_end_location_y',
+    'pass_goal_assist', 'pass_shot_assist',
+    'carry_end_location_x', 'carry_end_location_y',
+    'shot_outcome', 'shot_statsbomb_xg', 'duel_type', 'duel_outcome', 'card_type',
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS competitions (
+    competition_id INTEGER NOT NULL,
+    season_id INTEGER NOT NULL,
+    competition_name TEXT,
+    season_name TEXT,
+    country_name TEXT,
+    PRIMARY KEY (competition_id, season_id)
+);
+
+CREATE TABLE IF NOT EXISTS matches (
+    match_id INTEGER PRIMARY KEY,
+    competition_id INTEGER NOT NULL,
+    season_id INTEGER NOT NULL,
+    match_date TEXT,
+    competition_stage TEXT,
+    home_team TEXT,
+    away_team TEXT,
+    home_score INTEGER,
+    away_score INTEGER,
+    ingested INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_matches_season ON matches (competition_id, season_id);
+
+CREATE TABLE IF NOT EXISTS lineups (
+    match_id INTEGER NOT NULL,
+    team TEXT NOT NULL,
+    player_id INTEGER NOT NULL,
+    player_name TEXT,
+    jersey_number INTEGER,
+    position TEXT,
+    starter INTEGER,
+    minutes REAL,
+    PRIMARY KEY (match_id, player_id)
+);
+CREATE INDEX IF NOT EXISTS idx_lineups_player ON lineups (player_name);
+
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT PRIMARY KEY,
+    match_id INTEGER NOT NULL,
+    "index" INTEGER,
+    period INTEGER,
+    minute INTEGER,
+    second INTEGER,
+    team TEXT,
+    player TEXT,
+    position TEXT,
+    type TEXT,
+    play_pattern TEXT,
+    possession INTEGER,
+    possession_team TEXT,
+    location_x REAL,
+    location_y REAL,
+    under_pressure INTEGER,
+    pass_outcome TEXT,
+    pass_length REAL,
+    pass_end_location_x REAL,
+    pass_end_location_y REAL,
+    pass_goal_assist INTEGER,
+    pass_shot_assist INTEGER,
+    carry_end_location_x REAL,
+    carry_end_location_y REAL,
+    shot_outcome TEXT,
+    shot_statsbomb_xg REAL,
+    duel_type TEXT,
+    duel_outcome TEXT,
+    card_type TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_match_type ON events (match_id, type);
+CREATE INDEX IF NOT EXISTS idx_events_player ON events (player, match_id);
+
+CREATE TABLE IF NOT EXISTS player_match_stats (
+    match_id INTEGER NOT NULL,
+    player TEXT NOT NULL,
+    team TEXT,
+    passes_attempted INTEGER,
+    passes_completed INTEGER,
+    shots INTEGER,
+    shots_on_target INTEGER,
+    goals INTEGER,
+    assists INTEGER,
+    xg REAL,
+    tackles INTEGER,
+    interceptions INTEGER,
+    pressures INTEGER,
+    fouls_committed INTEGER,
+    fouls_won INTEGER,
+    minutes_played REAL,
+    PRIMARY KEY (match_id, player)
+);
+CREATE INDEX IF NOT EXISTS idx_player_match_stats_player ON player_match_stats (player);
+
+CREATE TABLE IF NOT EXISTS team_match_stats (
+    match_id INTEGER NOT NULL,
+    team TEXT NOT NULL,
+    passes_attempted INTEGER,
+    passes_completed INTEGER,
+    shots INTEGER,
+    shots_on_target INTEGER,
+    goals INTEGER,
+    assists INTEGER,
+    xg REAL,
+    tackles INTEGER,
+    interceptions INTEGER,
+    pressures INTEGER,
+    fouls_committed INTEGER,
+    fouls_won INTEGER,
+    PRIMARY KEY (match_id, team)
+);
+CREATE INDEX IF NOT EXISTS idx_team_match_stats_team ON team_match_stats (team);
+"""
+
+# Shared aggregate expressions of the materialized tables
+# Penalty shootout kicks (period 5) are not counted as shots, goals or xG
+AGGREGATES = """
+    SUM(type = 'Pass'),
+    SUM(type = 'Pass' AND pass_outcome IS NULL),
+    SUM(type = 'Shot' AND period IS NOT 5),
+    SUM(type = 'Shot' AND period IS NOT 5 AND shot_outcome IN ('Goal', 'Saved', 'Saved to Post')),
+    SUM(type = 'Shot' AND period IS NOT 5 AND shot_outcome = 'Goal'),
+    SUM(type = 'Pass' AND pass_goal_assist = 1),
+    COALESCE(SUM(CASE WHEN period IS NOT 5 THEN shot_statsbomb_xg END), 0),
+    SUM(type = 'Duel' AND duel_type = 'Tackle'),
+    SUM(type = 'Interception'),
+    SUM(type = 'Pressure'),
+    SUM(type = 'Foul Committed'),
+    SUM(type = 'Foul Won')
+"""
+
+MATERIALIZE_PLAYER_STATS = f"""
+INSERT INTO player_match_stats
+SELECT e.match_id, e.player, MIN(e.team), {AGGREGATES},
+       COALESCE((SELECT l.minutes FROM lineups l
+                 WHERE l.match_id = e.match_id AND l.player_name = e.player), MAX(e.minute))
+FROM events e
+WHERE e.match_id = ? AND e.player IS NOT NULL
+GROUP BY e.match_id, e.player
+"""
+
+MATERIALIZE_TEAM_STATS = f"""
+INSERT INTO team_match_stats
+SELECT match_id, team, {AGGREGATES}
+FROM events
+WHERE match_id = ? AND team IS NOT NULL
+GROUP BY match_id, team
+"""
+
+SUMMED_COLUMNS = ['passes_attempted', 'passes_completed', 'shots', 'shots_on_target', 'goals',
+                  'assists', 'xg', 'tackles', 'interceptions', 'pressures',
+                  'fouls_committed', 'fouls_won']
+
+
+@contextmanager
+def connect(path: Optional[str] = None) -> Iterator[sqlite3.Connection]:
+    """
+    Open the analytical store, creating the schema if needed.
+    Commits on success and rolls back on error.
+    """
+    connection = sqlite3.connect(path or STORE_PATH)
+    try:
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+        yield connection
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+
+def _split_xy(events: pd.DataFrame, column: str) -> pd.DataFrame:
+    if column not in events.columns:
+        return events.assign(**{f"{column}_x": np.nan, f"{column}_y": np.nan})
+    return events.assign(**{f"{column}_x": events[column].str[0],
+                            f"{column}_y": events[column].str[1]})
+
+
+def normalize_events(events: pd.DataFrame, match_id: int) -> pd.DataFrame:
+    """
+    Select and flatten the event columns stored in the analytical store.
+
+    Args:
+        events (pd.DataFrame): Flattened events of a match, as returned by `sb.events`.
+        match_id (int): The ID of the match.
+
+    Returns:
+        pd.DataFrame: The events with the EVENT_COLUMNS columns.
+    """
+    events = events.assign(match_id=match_id)
+    for column in ['location', 'pass_end_location', 'carry_end_location']:
+        events = _split_xy(events, column)
+    events = events.reindex(columns=EVENT_COLUMNS)
+    for column in ['under_pressure', 'pass_goal_assist', 'pass_shot_assist']:
+        events[column] = events[column].eq(True).astype(int)
+    return events.astype(object).where(events.notna(), None)
+
+
+def ingest_competitions(connection: sqlite3.Connection) -> int:
+    competitions = sb.competitions()
+    columns = ['competition_id', 'season_id', 'competition_name', 'season_name', 'country_name']
+    rows = competitions.reindex(columns=columns).astype(object)
+    rows = rows.where(rows.notna(), None).itertuples(index=False, name=None)
+    connection.executemany(
+        "INSERT OR REPLACE INTO competitions VALUES (?, ?, ?, ?, ?)", list(rows))
+    return len(competitions)
+
+
+def ingest_matches(connection: sqlite3.Connection, competition_id: int, season_id: int) -> List[int]:
+    """
+    Store the matches of a season (without their events) and return their IDs.
+    """
+    matches = sb.matches(competition_id=competition_id, season_id=season_id)
+    matches = matches.assign(competition_id=competition_id, season_id=season_id)
+    columns = ['match_id', 'competition_id', 'season_id', 'match_date', 'competition_stage',
+               'home_team', 'away_team', 'home_score', 'away_score']
+    rows = matches.reindex(columns=columns).astype(object)
+    rows = rows.where(rows.notna(), None).itertuples(index=False, name=None)
+    connection.executemany(
+        f"INSERT INTO matches ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+        f"ON CONFLICT (match_id) DO UPDATE SET "
+        f"{', '.join(f'{c} = excluded.{c}' for c in columns[1:])}",
+        list(rows))
+    return [int(match_id) for match_id in matches['match_id']]
+
+
+def ingest_match(connection: sqlite3.Connection, match_id: int) -> None:
+    """
+    Load the lineups and events of a match and refresh its aggregates.
+
+    Only the rows of this match are replaced, so the materialized tables are
+    maintained incrementally as matches are ingested.
+    """
+    players = get_lineup_index(match_id)["players"]
+    lineup_rows = players.reindex(columns=['team', 'player_id', 'player_name', 'jersey_number',
+                                           'position', 'starter', 'minutes']).astype(object)
+    lineup_rows = lineup_rows.where(lineup_rows.notna(), None)
+    events = normalize_events(sb.events(match_id=match_id), match_id)
+
+    for table in ['lineups', 'events', 'player_match_stats', 'team_match_stats']:
+        connection.execute(f"DELETE FROM {table} WHERE match_id = ?", (match_id,))
+    connection.executemany(
+        "INSERT INTO lineups VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [(match_id, *row) for row in lineup_rows.itertuples(index=False, name=None)])
+    connection.executemany(
+        f"INSERT INTO events VALUES ({', '.join('?' * len(EVENT_COLUMNS))})",
+        list(events.itertuples(index=False, name=None)))
+    connection.execute(MATERIALIZE_PLAYER_STATS, (match_id,))
+    connection.execute(MATERIALIZE_TEAM_STATS, (match_id,))
+    connection.execute("UPDATE matches SET ingested = 1 WHERE match_id = ?", (match_id,))
+
+
+def ingest_season(competition_id: int, season_id: int, refresh: bool = False,
+                  path: Optional[str] = None) -> List[int]:
+    """
+    Ingest every match of a season into the analytical store.
+
+    Args:
+        competition_id (int): The ID of the competition.
+        season_id (int): The ID of the season.
+        refresh (bool): Re-ingest matches that are already stored.
+        path (str): Path of the SQLite database (defaults to FOOTBALL_STORE_PATH).
+
+    Returns:
+        list: The IDs of the matches ingested by this call.
+    """
+    with connect(path) as connection:
+        ingest_competitions(connection)
+        match_ids = ingest_matches(connection, competition_id, season_id)
+        stored = {row[0] for row in connection.execute(
+            "SELECT match_id FROM matches WHERE ingested = 1 AND competition_id = ? AND season_id = ?",
+            (competition_id, season_id))}
+
+    ingested = []
+    for match_id in match_ids:
+        if match_id in stored and not refresh:
+            continue
+        # One transaction per match so an interrupted run keeps finished matches
+        with connect(path) as connection:
+            ingest_match(connection, match_id)
+        ingested.append(match_id)
+    return ingested
+
+
+def _season_filter(competition_id: Optional[int], season_id: Optional[int]) -> tuple:
+    clauses, params = [], []
+    if competition_id is not None:
+        clauses.append("m.competition_id = ?")
+        params.append(competition_id)
+    if season_id is not None:
+        clauses.append("m.season_id = ?")
+        params.append(season_id)
+    return "".join(f" AND {c}" for c in clauses), params
+
+
+def get_player_aggregates(player_name: str, competition_id: Optional[int] = None,
+                          season_id: Optional[int] = None, path: Optional[str] = None) -> str:
+    """
+    Return the statistics of a player summed over the stored matches.
+
+    Args:
+        player_name (str): Full or partial name of the player.
+        competition_id (int): Restrict to a competition (optional).
+        season_id (int): Restrict to a season (optional).
+        path (str): Path of the SQLite database (defaults to FOOTBALL_STORE_PATH).
+
+    Returns:
+        str: JSON string with one entry per matching player.
+    """
+    where, params = _season_filter(competition_id, season_id)
+    sums = ", ".join(f"SUM(s.{c}) AS {c}" for c in SUMMED_COLUMNS)
+    query = f"""
+        SELECT s.player, COUNT(*) AS matches, SUM(s.minutes_played) AS minutes_played, {sums}
+        FROM player_match_stats s JOIN matches m ON m.match_id = s.match_id
+        WHERE s.player LIKE ?{where}
+        GROUP BY s.player
+        ORDER BY minutes_played DESC
+    """
+    with connect(path) as connection:
+        players = pd.read_sql_query(query, connection, params=[f"%{player_name}%", *params])
+    players['pass_completion'] = (players['passes_completed']
+                                  / players['passes_attempted'].replace(0, np.nan)).round(3)
+    players['xg_per_shot'] = (players['xg'] / players['shots'].replace(0, np.nan)).round(3)
+    return records_json(players).decode()
+
+
+def get_player_match_stats(player_name: str, competition_id: Optional[int] = None,
+                           season_id: Optional[int] = None, path: Optional[str] = None) -> str:
+    """
+    Return the per-match statistics of a player, ordered by match date.
+
+    Args:
+        player_name (str): Full or partial name of the player.
+        competition_id (int): Restrict to a competition (optional).
+        season_id (int): Restrict to a season (optional).
+        path (str): Path of the SQLite database (defaults to FOOTBALL_STORE_PATH).
+
+    Returns:
+        str: JSON string with one entry per match played.
+    """
+    where, params = _season_filter(competition_id, season_id)
+    query = f"""
+        SELECT m.match_date, m.home_team, m.away_team, s.*
+        FROM player_match_stats s JOIN matches m ON m.match_id = s.match_id
+        WHERE s.player LIKE ?{where}
+        ORDER BY m.match_date
+    """
+    with connect(path) as connection:
+        rows = pd.read_sql_query(query, connection, params=[f"%{player_name}%", *params])
+    return records_json(rows).decode()
+
+
+def get_team_aggregates(team: str, competition_id: Optional[int] = None,
+                        season_id: Optional[int] = None, path: Optional[str] = None) -> str:
+    """
+    Return the statistics of a team summed over the stored matches.
+
+    Args:
+        team (str): Name of the team.
+        competition_id (int): Restrict to a competition (optional).
+        season_id (int): Restrict to a season (optional).
+        path (str): Path of the SQLite database (defaults to FOOTBALL_STORE_PATH).
+
+    Returns:
+        str: JSON string with the team totals.
+    """
+    where, params = _season_filter(competition_id, season_id)
+    sums = ", ".join(f"SUM(s.{c}) AS {c}" for c in SUMMED_COLUMNS)
+    query = f"""
+        SELECT s.team, COUNT(*) AS matches, {sums}
+        FROM team_match_stats s JOIN matches m ON m.match_id = s.match_id
+        WHERE s.team = ?{where}
+        GROUP BY s.team
+    """
+    with connect(path) as connection:
+        teams = pd.read_sql_query(query, connection, params=[team, *params])
+    return records_json(teams).decode()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest a StatsBomb season into the analytical store.")
+    parser.add_argument("competition_id", type=int)
+    parser.add_argument("season_id", type=int)
+    parser.add_argument("--refresh", action="store_true", help="re-ingest stored matches")
+    parser.add_argument("--path", default=None, help="SQLite database path")
+    args = parser.parse_args()
+    ingested = ingest_season(args.competition_id, args.season_id, args.refresh, args.path)
+    print(f"Ingested {len(ingested)} matches into {args.path or STORE_PATH}")
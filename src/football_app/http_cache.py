@@ -0,0 +1,87 @@
+import hashlib
+import json
+import os
+
+from typing import Callable, Optional
+
+from fastapi import Response
+
+from .football_stats.memory_budget import BudgetedCache
+from .football_stats.serialization import JSON_MEDIA_TYPE
+
+
+# Bump to invalidate every ETag handed out so far (e.g. after a change in the
+# shape of the responses).
+# 5: events omit the attributes they do not have instead of carrying nulls.
+DATA_VERSION = "5"
+
+# StatsBomb only publishes completed matches, so match resources never change.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Size of the serialized body cache; 0 disables it
+RESPONSE_CACHE_BYTES = int(os.getenv("FOOTBALL_RESPONSE_CACHE_BYTES", str(64 * 1024 * 1024)))
+
+
+class ResponseCache(BudgetedCache):
+    """
+    Bounded LRU cache of serialized response bodies, keyed by ETag.
+    Cached bodies are charged to the global memory budget.
+    """
+
+    def __init__(self, max_bytes: int = RESPONSE_CACHE_BYTES):
+        super().__init__("responses", max_bytes=max_bytes, sizeof=len)
+
+
+response_cache = ResponseCache()
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a strong ETag from the parts identifying a resource.
+
+    The ETag only depends on the resource identity (and DATA_VERSION), so it can
+    be computed without loading any match data.
+    """
+    digest = hashlib.sha256(json.dumps([DATA_VERSION, *parts], default=str).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header value against an ETag.
+
+    "*" is not honoured: the ETag only identifies the resource, so it would
+    answer 304 for matches or players that do not exist.
+    """
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return any(c.removeprefix("W/") == etag for c in candidates)
+
+
+def immutable_response(etag: str, if_none_match: Optional[str], compute: Callable[[], bytes],
+                       media_type: str = JSON_MEDIA_TYPE) -> Response:
+    """
+    Answer a request for an immutable resource.
+
+    Returns 304 when the client already holds the ETag, the cached body when one
+    is available, and otherwise calls `compute` for the serialized body and
+    caches it. The ETag must identify the media type too, since the body
+    depends on the negotiated format.
+    """
+    headers = {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL, "Vary": "Accept"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached_body(etag, compute), media_type=media_type,
+                    headers=headers)
+
+
+def cached_body(etag: str, compute: Callable[[], bytes]) -> bytes:
+    """
+    Return the serialized body stored under `etag`, computing and caching it on a miss.
+    """
+    body = response_cache.get(etag)
+    if body is None:
+        body = compute()
+        response_cache.put(etag, body)
+    return body
@@ -0,0 +1,167 @@
+"""
+Load-testing harness for the Football Insights API.
+
+Run from the repository root:
+
+    # Compare two configurations against local stand-ins
+    python -m src.football_app.loadtest run --concurrency 16 --duration 30 \\
+        --config inline:FOOTBALL_CPU_WORKERS=0,FOOTBALL_RESPONSE_CACHE_BYTES=0 \\
+        --config pooled:FOOTBALL_CPU_WORKERS=4
+
+    # Drive an already running API instead
+    python -m src.football_app.loadtest run --target http://localhost:8000 --match-ids 3869685 \\
+        --season 43:106
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from .fixtures import COMPETITION_ID, SEASON_ID, serve_fixtures, write_fixtures
+from .runner import DEFAULT_MIX, format_report, parse_mix, run_load
+
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+
+def parse_config(spec: str) -> Tuple[str, Dict[str, str]]:
+    """
+    Parse a configuration such as "pooled:FOOTBALL_CPU_WORKERS=4,FOOTBALL_MEMORY_TRACKING=1".
+    """
+    name, _, assignments = spec.partition(":")
+    env = {}
+    for assignment in filter(None, assignments.split(",")):
+        key, _, value = assignment.partition("=")
+        env[key.strip()] = value.strip()
+    return name, env
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(base_url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"API server exited with code {process.returncode}.")
+        try:
+            if httpx.get(f"{base_url}/memory", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("API server did not become ready in time.")
+
+
+def serve(args: argparse.Namespace) -> None:
+    """
+    Run the API with statsbombpy and the LLM replaced by local stand-ins.
+    """
+    import uvicorn
+
+    from .standins import install_standins
+    from .. import workers
+
+    install_standins(args.fixtures_url, args.llm_latency)
+    workers.configure(install_standins, (args.fixtures_url, args.llm_latency))
+    from ..api import app
+
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+def _run_config(name: str, env: Dict[str, str], fixtures_url: str, match_ids: List[int],
+                args: argparse.Namespace, mix: Dict[str, float]) -> Dict[str, dict]:
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        server_env = {**os.environ, "FOOTBALL_SHARED_CACHE_DIR": cache_dir, **env}
+        process = subprocess.Popen(
+            [sys.executable, "-m", "src.football_app.loadtest", "serve", "--port", str(port),
+             "--fixtures-url", fixtures_url, "--llm-latency", str(args.llm_latency)],
+            cwd=REPO_ROOT, env=server_env)
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            _wait_ready(base_url, process)
+            print(f"Running '{name}' against {base_url}...", file=sys.stderr)
+            return asyncio.run(run_load(base_url, match_ids, mix, args.concurrency,
+                                        args.duration, args.max_requests, seed=args.seed))
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+
+def run(args: argparse.Namespace) -> None:
+    mix = parse_mix(args.mix) if args.mix else DEFAULT_MIX
+    reports = {}
+    if args.target:
+        match_ids = [int(m) for m in args.match_ids.split(",")]
+        competition_id, _, season_id = args.season.partition(":")
+        reports["target"] = asyncio.run(run_load(args.target, match_ids, mix, args.concurrency,
+                                                 args.duration, args.max_requests, seed=args.seed,
+                                                 season=(int(competition_id), int(season_id))))
+    else:
+        configs = [parse_config(spec) for spec in args.config] or [("default", {})]
+        with tempfile.TemporaryDirectory() as fixtures_dir:
+            match_ids = write_fixtures(fixtures_dir, args.matches, args.events_per_match, args.seed)
+            server, fixtures_url = serve_fixtures(fixtures_dir)
+            try:
+                for name, env in configs:
+                    reports[name] = _run_config(name, env, fixtures_url, match_ids, args, mix)
+            finally:
+                server.shutdown()
+
+    print(format_report(reports))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(reports, f, indent=2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.football_app.loadtest",
+                                     description="Load-test the Football Insights API.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="generate load and report the results")
+    run_parser.add_argument("--concurrency", type=int, default=8, help="concurrent clients")
+    run_parser.add_argument("--duration", type=float, default=30.0, help="seconds per configuration")
+    run_parser.add_argument("--max-requests", type=int, default=None, help="stop after N requests")
+    run_parser.add_argument("--mix", default=None,
+                            help="endpoint weights, e.g. match_summary=6,player_profile=3,match_narrative=1,"
+                                 "match_list=1")
+    run_parser.add_argument("--config", action="append", default=[],
+                            help="NAME:ENV=VALUE,... server configuration (repeat to compare)")
+    run_parser.add_argument("--llm-latency", type=float, default=0.5, help="fake LLM latency in seconds")
+    run_parser.add_argument("--matches", type=int, default=10, help="fixture matches")
+    run_parser.add_argument("--events-per-match", type=int, default=3000, help="fixture events per match")
+    run_parser.add_argument("--target", default=None, help="drive a running API instead of stand-ins")
+    run_parser.add_argument("--match-ids", default="", help="match IDs for --target, comma-separated")
+    run_parser.add_argument("--season", default=f"{COMPETITION_ID}:{SEASON_ID}",
+                            help="COMPETITION_ID:SEASON_ID of the match list requests for --target")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--json", default=None, help="also write the reports to this file")
+    run_parser.set_defaults(func=run)
+
+    serve_parser = commands.add_parser("serve", help="run the API against the stand-ins")
+    serve_parser.add_argument("--port", type=int, required=True)
+    serve_parser.add_argument("--fixtures-url", required=True)
+    serve_parser.add_argument("--llm-latency", type=float, default=0.5)
+    serve_parser.set_defaults(func=serve)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import json
+import os
+import random
+import threading
+import uuid
+
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+
+
+COMPETITION_ID = 9001
+SEASON_ID = 1
+POSITIONS = ['Goalkeeper', 'Right Back', 'Right Center Back', 'Left Center Back', 'Left Back',
+             'Right Defensive Midfield', 'Left Defensive Midfield', 'Right Wing',
+             'Center Attacking Midfield', 'Left Wing', 'Center Forward']
+
+
+def _named(id_: int, name: str) -> dict:
+    return {"id": id_, "name": name}
+
+
+def _team_players(team_index: int) -> List[dict]:
+    return [{"player_id": team_index * 100 + number,
+             "player_name": f"Player {team_index}-{number}",
+             "player_nickname": None,
+             "jersey_number": number,
+             "country": _named(1, "Fixtureland"),
+             "cards": [],
+             "positions": [{"position_id": number, "position": POSITIONS[number - 1],
+                            "from": "00:00", "to": None, "from_period": 1, "to_period": None,
+                            "start_reason": "Starting XI", "end_reason": "Final Whistle"}]}
+            for number in range(1, 12)]
+
+
+def _team(side: str, team: Tuple[int, str]) -> dict:
+    team_id, name = team
+    return {f"{side}_team_id": team_id, f"{side}_team_name": name, f"{side}_team_gender": "male",
+            f"{side}_team_group": None, "country": _named(1, "Fixtureland"),
+            "managers": [{"id": team_id, "name": f"Manager {team_id}", "nickname": None,
+                          "dob": "1970-01-01", "country": _named(1, "Fixtureland")}]}
+
+
+def _event(rng: random.Random, index: int, minute: int, team: Tuple[int, str],
+           player: dict) -> dict:
+    event = {
+        "id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "index": index,
+        "period": 1 if minute < 45 else 2,
+        "timestamp": f"00:{minute % 45:02d}:00.000",
+        "minute": minute,
+        "second": rng.randrange(60),
+        "possession": index // 5,
+        "possession_team": _named(*team),
+        "play_pattern": _named(1, "Regular Play"),
+        "team": _named(*team),
+        "player": _named(player["player_id"], player["player_name"]),
+        "position": _named(player["jersey_number"], POSITIONS[player["jersey_number"] - 1]),
+        "location": [round(rng.uniform(0, 120), 1), round(rng.uniform(0, 80), 1)],
+        "duration": round(rng.uniform(0, 3), 3),
+    }
+    end_location = [round(rng.uniform(0, 120), 1), round(rng.uniform(0, 80), 1)]
+    kind = rng.choices(['Pass', 'Carry', 'Pressure', 'Duel', 'Shot'], [50, 30, 12, 6, 2])[0]
+    event["type"] = _named(index, kind)
+    if kind == 'Pass':
+        event["pass"] = {"length": round(rng.uniform(5, 50), 1), "angle": 0.0,
+                         "end_location": end_location, "height": _named(1, "Ground Pass")}
+        if rng.random() < 0.2:
+            event["pass"]["outcome"] = _named(9, "Incomplete")
+    elif kind == 'Carry':
+        event["carry"] = {"end_location": end_location}
+    elif kind == 'Duel':
+        event["duel"] = {"type": _named(11, "Tackle"), "outcome": _named(4, "Won")}
+    elif kind == 'Shot':
+        outcome = rng.choice(["Goal", "Saved", "Off T", "Blocked"])
+        event["shot"] = {"statsbomb_xg": round(rng.uniform(0.01, 0.6), 3),
+                         "end_location": [120.0, 40.0, 1.0], "outcome": _named(97, outcome)}
+    return event
+
+
+def write_fixtures(directory: str, matches: int = 10, events_per_match: int = 3000,
+                   seed: int = 0) -> List[int]:
+    """
+    Write a synthetic StatsBomb open-data tree (competitions, matches, lineups
+    and events) under `directory` and return the generated match IDs.
+    """
+    rng = random.Random(seed)
+    data = os.path.join(directory, "data")
+    for sub in ["matches/%d" % COMPETITION_ID, "lineups", "events", "three-sixty"]:
+        os.makedirs(os.path.join(data, sub), exist_ok=True)
+
+    competition = {"competition_id": COMPETITION_ID, "season_id": SEASON_ID,
+                   "country_name": "Fixtureland", "competition_name": "Fixture League",
+                   "competition_gender": "male", "competition_youth": False,
+                   "competition_international": False, "season_name": "2024",
+                   "match_updated": None, "match_available": None}
+    with open(os.path.join(data, "competitions.json"), "w") as f:
+        json.dump([competition], f)
+
+    match_ids, match_list = [], []
+    for m in range(matches):
+        match_id = 900000 + m
+        home, away = (2 * m + 1, f"Home FC {m}"), (2 * m + 2, f"Away FC {m}")
+        lineups = [{"team_id": team_id, "team_name": name, "lineup": _team_players(team_id)}
+                   for team_id, name in (home, away)]
+        events = [_event(rng, i + 1, min(i * 95 // events_per_match, 94),
+                         home if i % 2 else away,
+                         rng.choice(lineups[i % 2 == 0]["lineup"]))
+                  for i in range(events_per_match)]
+        goals = [sum(1 for e in events if e["team"]["id"] == team_id
+                     and e.get("shot", {}).get("outcome", {}).get("name") == "Goal")
+                 for team_id, _ in (home, away)]
+        with open(os.path.join(data, "lineups", f"{match_id}.json"), "w") as f:
+            json.dump(lineups, f)
+        with open(os.path.join(data, "events", f"{match_id}.json"), "w") as f:
+            json.dump(events, f)
+        # Complete open-data match records: sb.matches reads the managers,
+        # stadium, referee and metadata of every match
+        match_list.append({
+            "match_id": match_id, "match_date": "2024-01-%02d" % (m % 28 + 1),
+            "kick_off": "20:00:00.000",
+            "competition": {"competition_id": COMPETITION_ID, "country_name": "Fixtureland",
+                            "competition_name": "Fixture League"},
+            "season": {"season_id": SEASON_ID, "season_name": "2024"},
+            "home_team": _team("home", home),
+            "away_team": _team("away", away),
+            "home_score": goals[0], "away_score": goals[1], "match_status": "available",
+            "match_status_360": "unscheduled", "last_updated": "2024-02-01T00:00:00.000",
+            "last_updated_360": None,
+            "metadata": {"data_version": "1.1.0", "shot_fidelity_version": "2",
+                         "xy_fidelity_version": "2"},
+            "match_week": m + 1, "competition_stage": _named(1, "Regular Season"),
+            "stadium": {**_named(m + 1, f"Fixture Stadium {m}"), "country": _named(1, "Fixtureland")},
+            "referee": {**_named(m + 1, f"Referee {m}"), "country": _named(1, "Fixtureland")},
+        })
+        match_ids.append(match_id)
+
+    with open(os.path.join(data, "matches", str(COMPETITION_ID), f"{SEASON_ID}.json"), "w") as f:
+        json.dump(match_list, f)
+    return match_ids
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_fixtures(directory: str, host: str = "127.0.0.1",
+                   port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Serve the fixture tree over HTTP from a background thread.
+
+    Returns:
+        tuple: The server (call `shutdown()` to stop it) and the base URL of the data.
+    """
+    server = ThreadingHTTPServer((host, port), partial(QuietHandler, directory=directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/data"
+
+
+def fixture_player(match_id: int, rng: Optional[random.Random] = None) -> str:
+    """
+    Return the name of a player of a fixture match (as generated by `write_fixtures`).
+    """
+    rng = rng or random
+    team_id = 2 * (match_id - 900000) + rng.choice([1, 2])
+    return f"Player {team_id}-{rng.randint(1, 11)}"
@@ -0,0 +1,151 @@
+import asyncio
+import random
+import time
+
+import httpx
+
+from typing import Dict, List, Optional, Tuple
+
+from .fixtures import COMPETITION_ID, SEASON_ID, fixture_player
+
+
+STYLES = ["formal", "humoristic", "technical"]
+DEFAULT_MIX = {"match_summary": 6.0, "player_profile": 3.0, "match_narrative": 1.0, "match_list": 1.0}
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """
+    Parse a request mix such as "match_summary=6,player_profile=3,match_narrative=1,match_list=1".
+    """
+    mix = {}
+    for part in spec.split(","):
+        endpoint, _, weight = part.partition("=")
+        if endpoint.strip() not in DEFAULT_MIX:
+            raise ValueError(f"Unknown endpoint '{endpoint}'. Choose from: {', '.join(DEFAULT_MIX)}.")
+        mix[endpoint.strip()] = float(weight or 1)
+    return mix
+
+
+def _request(endpoint: str, match_id: int, rng: random.Random,
+             season: Tuple[int, int]) -> Tuple[str, str, Optional[dict]]:
+    """
+    Return the method, path and JSON body of a request to `endpoint`.
+    """
+    if endpoint == "match_list":
+        competition_id, season_id = season
+        return "GET", f"/competitions/{competition_id}/seasons/{season_id}/matches", None
+    if endpoint == "player_profile":
+        return "POST", f"/{endpoint}", {"match_id": match_id, "player_name": fixture_player(match_id, rng)}
+    if endpoint == "match_narrative":
+        return "POST", f"/{endpoint}", {"match_id": match_id, "style": rng.choice(STYLES)}
+    return "POST", f"/{endpoint}", {"match_id": match_id}
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    rank = q / 100 * (len(values) - 1)
+    low = int(rank)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def summarize(samples: List[tuple], elapsed: float) -> Dict[str, dict]:
+    """
+    Summarize (endpoint, latency, ok) samples per endpoint and overall.
+    """
+    groups: Dict[str, List[tuple]] = {"all": samples}
+    for sample in samples:
+        groups.setdefault(sample[0], []).append(sample)
+    report = {}
+    for name, group in groups.items():
+        latencies = [latency for _, latency, ok in group if ok]
+        errors = sum(1 for _, _, ok in group if not ok)
+        report[name] = {
+            "requests": len(group),
+            "errors": errors,
+            "error_rate": errors / len(group) if group else 0.0,
+            "throughput": len(group) / elapsed if elapsed else 0.0,
+            "p50_ms": _ms(percentile(latencies, 50)),
+            "p95_ms": _ms(percentile(latencies, 95)),
+            "p99_ms": _ms(percentile(latencies, 99)),
+        }
+    return report
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+async def run_load(base_url: str, match_ids: List[int], mix: Dict[str, float] = DEFAULT_MIX,
+                   concurrency: int = 8, duration: float = 30.0, max_requests: Optional[int] = None,
+                   timeout: float = 60.0, seed: int = 0,
+                   season: Tuple[int, int] = (COMPETITION_ID, SEASON_ID)) -> Dict[str, dict]:
+    """
+    Drive the API with `concurrency` clients for `duration` seconds (or until
+    `max_requests` requests were sent).
+
+    Args:
+        base_url (str): Base URL of the API.
+        match_ids (list): Match IDs requests are drawn from.
+        mix (dict): Relative weight of each endpoint.
+        concurrency (int): Number of concurrent clients.
+        duration (float): Length of the run in seconds.
+        max_requests (int): Stop after this many requests (optional).
+        timeout (float): Per-request timeout in seconds.
+        seed (int): Seed of the request sequence.
+        season (tuple): Competition and season IDs of the match list requests.
+
+    Returns:
+        dict: Throughput, latency percentiles and error rates per endpoint and overall.
+    """
+    endpoints, weights = list(mix), list(mix.values())
+    samples: List[tuple] = []
+    deadline = time.perf_counter() + duration
+    sent = 0
+
+    async def client(worker: int, http: httpx.AsyncClient) -> None:
+        nonlocal sent
+        rng = random.Random(seed * 1000 + worker)
+        while time.perf_counter() < deadline and (max_requests is None or sent < max_requests):
+            sent += 1
+            endpoint = rng.choices(endpoints, weights)[0]
+            method, path, payload = _request(endpoint, rng.choice(match_ids), rng, season)
+            started = time.perf_counter()
+            try:
+                response = await http.request(method, path, json=payload)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            samples.append((endpoint, time.perf_counter() - started, ok))
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as http:
+        started = time.perf_counter()
+        await asyncio.gather(*(client(worker, http) for worker in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return summarize(samples, elapsed)
+
+
+def format_report(reports: Dict[str, Dict[str, dict]]) -> str:
+    """
+    Format the reports of several configurations side by side.
+    """
+    names = list(reports)
+    sections = sorted({section for report in reports.values() for section in report},
+                      key=lambda s: (s != "all", s))
+    metrics = ["requests", "throughput", "p50_ms", "p95_ms", "p99_ms", "error_rate"]
+    width = max([12] + [len(name) for name in names]) + 2
+    lines = [f"{'':<32}" + "".join(f"{name:>{width}}" for name in names)]
+    for section in sections:
+        for metric in metrics:
+            row = f"{section + ' ' + metric:<32}"
+            for name in names:
+                value = reports[name].get(section, {}).get(metric)
+                if isinstance(value, float):
+                    value = f"{value:.3f}" if metric == "error_rate" else f"{value:.1f}"
+                row += f"{'-' if value is None else value:>{width}}"
+            lines.append(row)
+        lines.append("")
+    return "\n".join(lines)
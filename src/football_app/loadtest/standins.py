@@ -0,0 +1,46 @@
+import time
+
+from typing import Any, List, Optional
+
+from langchain_core.language_models.llms import LLM
+
+
+class FakeLatencyLLM(LLM):
+    """
+    Stand-in for the Gemini model: answers after a fixed latency.
+    """
+
+    latency: float = 0.5
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-latency"
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None,
+              run_manager: Any = None, **kwargs: Any) -> str:
+        time.sleep(self.latency)
+        return f"Fake narrative generated from a {len(prompt)}-character prompt."
+
+
+def install_standins(fixtures_url: str, llm_latency: float) -> None:
+    """
+    Point statsbombpy at the local fixture server and replace the LLM used
+    for narratives by FakeLatencyLLM, in the current process.
+
+    Also used as the CPU pool initializer, so pool processes load the
+    fixtures too.
+    """
+    from statsbombpy import config
+    from ..football_stats import matches
+
+    for key, path in {
+        "competitions": "/competitions.json",
+        "matches": "/matches/{competition_id}/{season_id}.json",
+        "lineups": "/lineups/{match_id}.json",
+        "events": "/events/{match_id}.json",
+        "frames": "/three-sixty/{match_id}.json",
+    }.items():
+        # Mutated in place: statsbombpy modules hold references to this dict
+        config.OPEN_DATA_PATHS[key] = fixtures_url + path
+
+    matches.GoogleGenerativeAI = lambda **kwargs: FakeLatencyLLM(latency=llm_latency)
@@ -0,0 +1,99 @@
+import os
+
+from typing import Any, Dict, List
+
+from langchain.memory import ConversationBufferMemory, ConversationSummaryBufferMemory
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import BaseMessage, get_buffer_string
+from langchain_google_genai import GoogleGenerativeAI
+
+
+# What the agent prompt receives: "buffer" passes the whole history, "summary"
+# a recent window plus a running summary of older messages under
+# CHAT_MEMORY_MAX_TOKENS.
+CHAT_MEMORY_MODE = os.getenv("CHAT_MEMORY_MODE", "summary")
+CHAT_MEMORY_MAX_TOKENS = int(os.getenv("CHAT_MEMORY_MAX_TOKENS", "2000"))
+
+
+def approximate_tokens(messages: List[BaseMessage]) -> int:
+    """
+    Estimate the number of tokens of a list of messages (~4 characters per token).
+    """
+    return sum(len(str(message.content)) // 4 + 4 for message in messages)
+
+
+class BoundedConversationMemory(ConversationSummaryBufferMemory):
+    """
+    Bounds what the agent prompt receives: the recent messages that fit in the
+    token budget plus a running summary of the older ones.
+
+    The message history itself is never truncated (it is also what the chat
+    displays). Tokens are estimated locally; the model is only called to fold
+    messages that left the window into the summary, when the variables are
+    loaded for a prompt.
+    """
+
+    summarized_messages: int = 0
+
+    def window_start(self) -> int:
+        """
+        Index of the first message of the recent window (at least one message is kept).
+        """
+        messages = self.chat_memory.messages
+        start, tokens = len(messages), 0
+        while start > 0:
+            tokens += approximate_tokens(messages[start - 1:start])
+            if tokens > self.max_token_limit:
+                break
+            start -= 1
+        return min(start, max(len(messages) - 1, 0))
+
+    def prune(self) -> None:
+        messages = self.chat_memory.messages
+        start = self.window_start()
+        if start > self.summarized_messages:
+            self.moving_summary_buffer = self.predict_new_summary(
+                messages[self.summarized_messages:start], self.moving_summary_buffer
+            )
+            self.summarized_messages = start
+
+    def load_memory_variables(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        self.prune()
+        buffer = self.chat_memory.messages[self.window_start():]
+        if self.moving_summary_buffer:
+            buffer = [self.summary_message_cls(content=self.moving_summary_buffer)] + buffer
+        if not self.return_messages:
+            buffer = get_buffer_string(buffer, human_prefix=self.human_prefix,
+                                       ai_prefix=self.ai_prefix)
+        return {self.memory_key: buffer}
+
+    def clear(self) -> None:
+        super().clear()
+        self.summarized_messages = 0
+
+
+def build_memory(messages: BaseChatMessageHistory,
+                 mode: str = CHAT_MEMORY_MODE,
+                 max_token_limit: int = CHAT_MEMORY_MAX_TOKENS):
+    """
+    Build the conversation memory of the chat; its "chat_history" variable
+    is a string for the agent prompt.
+
+    Args:
+        messages (BaseChatMessageHistory): The message history backing the memory.
+        mode (str): "summary" for the bounded memory, "buffer" for the full history.
+        max_token_limit (int): Token budget of the recent-message window.
+
+    Returns:
+        The conversation memory.
+    """
+    if mode == "buffer":
+        return ConversationBufferMemory(chat_memory=messages, memory_key="chat_history")
+    if mode != "summary":
+        raise ValueError("Invalid memory mode. Choose from: 'buffer', 'summary'.")
+    return BoundedConversationMemory(
+        llm=GoogleGenerativeAI(model="gemini-pro", temperature=0),
+        chat_memory=messages,
+        memory_key="chat_history",
+        max_token_limit=max_token_limit,
+    )
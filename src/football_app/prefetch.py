@@ -0,0 +1,103 @@
+import threading
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Hashable, Iterable, Tuple
+
+from football_stats.lineups import get_lineup_index, get_starting_xi
+from football_stats.matches import load_events
+from tools.football import generate_match_summary, get_sport_specialist_comments_about_match
+
+
+def _warm(load: Callable, match_id: int) -> None:
+    # Only fill the process-wide caches (shared events, lineup index): the
+    # futures kept in the session must not pin the loaded frames.
+    load(match_id)
+
+
+def _failed(future: Future) -> bool:
+    return future.cancelled() or (future.done() and future.exception() is not None)
+
+
+class MatchPrefetcher:
+    """
+    Session-level cache of the work behind a match page.
+
+    As soon as a match is selected, its events and lineups are loaded and the
+    summary and specialist commentary are generated concurrently in background
+    threads; the page sections then only wait for the results. Neighbouring
+    matches get their data prefetched too (without LLM calls).
+    """
+
+    def __init__(self, max_workers: int = 4, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._futures: "OrderedDict[Hashable, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _submit(self, key: Hashable, task: Callable) -> Future:
+        with self._lock:
+            future = self._futures.get(key)
+            # Failed tasks are resubmitted, so the next rerun of the page retries them
+            if future is not None and not _failed(future):
+                self._futures.move_to_end(key)
+                return future
+            future = self._pool.submit(task)
+            self._futures[key] = future
+            while len(self._futures) > self.max_entries:
+                _, evicted = self._futures.popitem(last=False)
+                evicted.cancel()
+        return future
+
+    def prefetch_data(self, match_id: int) -> Tuple[Future, Future]:
+        """
+        Start loading the events and lineups of a match into the process-wide caches.
+
+        Returns:
+            tuple: The futures of the events and of the lineups (their result is None).
+        """
+        events = self._submit(("events", match_id), lambda: _warm(load_events, match_id))
+        lineups = self._submit(("lineups", match_id), lambda: _warm(get_lineup_index, match_id))
+        return events, lineups
+
+    def start_match(self, match_id: int, match_details: dict, competition: str, season: str) -> None:
+        """
+        Start everything the page of a match needs: data, summary and commentary.
+        """
+        events, lineups = self.prefetch_data(match_id)
+
+        def summary() -> str:
+            # Wait for the warmed events cache instead of fetching the events a second time
+            events.result()
+            return generate_match_summary(
+                match_id=match_id,
+                match_details={
+                    "home_team": match_details['home_team'],
+                    "away_team": match_details['away_team'],
+                    "competition": competition,
+                    "season": season,
+                    "score": f"{match_details.get('home_score', 'N/A')} - {match_details.get('away_score', 'N/A')}"
+                }
+            )
+
+        def comments() -> str:
+            lineups.result()
+            return get_sport_specialist_comments_about_match(match_details, get_starting_xi(match_id))
+
+        self._submit(("summary", match_id), summary)
+        self._submit(("comments", match_id), comments)
+
+    def prefetch_neighbours(self, match_ids: Iterable[int]) -> None:
+        for match_id in match_ids:
+            self.prefetch_data(match_id)
+
+    def result(self, kind: str, match_id: int):
+        """
+        Wait for a prefetched result ("summary" or "comments"; "events" and
+        "lineups" only tell that the data is loaded).
+        """
+        with self._lock:
+            future = self._futures.get((kind, match_id))
+        if future is None or future.cancelled():
+            raise KeyError(f"Nothing prefetched for {kind} of match {match_id}.")
+        return future.result()
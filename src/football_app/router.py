@@ -0,0 +1,248 @@
+import json
+import re
+import threading
+import time
+
+from typing import Callable, Dict, List, Optional
+
+from football_stats.lineups import get_lineup_index, get_starting_xi
+from football_stats.matches import get_player_profile
+from tools.football import retrieve_match_details
+from agent import load_agent
+
+
+class RoutingStats:
+    """
+    Counters of how chat messages were answered (fast path vs. agent).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.routed: Dict[str, int] = {}
+        self.fast_path_seconds = 0.0
+        self.agent_calls = 0
+        self.agent_seconds = 0.0
+
+    def record_fast_path(self, intent: str, seconds: float) -> None:
+        with self._lock:
+            self.routed[intent] = self.routed.get(intent, 0) + 1
+            self.fast_path_seconds += seconds
+
+    def record_agent(self, seconds: float) -> None:
+        with self._lock:
+            self.agent_calls += 1
+            self.agent_seconds += seconds
+
+    def summary(self) -> dict:
+        """
+        Return the counters and an estimate of the agent latency avoided,
+        based on the mean latency of the messages that did reach the agent.
+        """
+        with self._lock:
+            routed = sum(self.routed.values())
+            mean_agent = self.agent_seconds / self.agent_calls if self.agent_calls else None
+            avoided = (routed * mean_agent - self.fast_path_seconds) if mean_agent is not None else None
+            return {
+                "routed": dict(self.routed),
+                "routed_total": routed,
+                "agent_calls": self.agent_calls,
+                "fast_path_seconds": round(self.fast_path_seconds, 3),
+                "mean_agent_seconds": round(mean_agent, 3) if mean_agent is not None else None,
+                "estimated_seconds_avoided": round(avoided, 3) if avoided is not None else None,
+            }
+
+
+routing_stats = RoutingStats()
+
+
+# Patterns must match the whole question: anything else, including questions
+# that merely mention a score or a lineup, still reaches the agent.
+SCORE_PATTERN = re.compile(
+    r"^\s*(what was the (final )?(score|result)|what('s| is) the (final )?score|final score"
+    r"|who won( the (match|game))?)\s*\??\s*$", re.IGNORECASE)
+STARTING_XI_PATTERN = re.compile(
+    r"^\s*((what|who) (was|were|is|are) (in )?|(show|give|list|tell) (me )?)?(the )?([\w .-]+?'s )?"
+    r"starting (xi|eleven|line-?up)"
+    r"( (of|for) [\w .'-]+?)?\s*\??\s*$"
+    r"|^\s*who started( for [\w .'-]+?)?( (in )?the (match|game))?\s*\??\s*$", re.IGNORECASE)
+PLAYER_STAT_PATTERN = re.compile(
+    r"^\s*how many (?P<stat>passes|shots|tackles|interceptions|fouls)"
+    r"(?: (?:on target))? (?:did|has|had) (?P<player>.+?)"
+    r" (?P<verb>complete|attempt|make|take|have|commit|win|get|play)"
+    r"(?: (?:in|during) the (?:match|game))?\s*\??\s*$",
+    re.IGNORECASE,
+)
+# Questions asking for analysis are never answered from the patterns above
+ANALYTICAL_PATTERN = re.compile(
+    r"\b(compar\w*|why|how (did|does|do|was|were)|analy[sz]\w*|explain\w*|tactic\w*"
+    r"|perform\w*|assess\w*|evaluat\w*|mean\w*|impact\w*)\b", re.IGNORECASE)
+
+PLAYER_STAT_FIELDS = {
+    "passes": [("passes_completed", "completed"), ("passes_attempted", "attempted")],
+    "shots": [("shots", "total"), ("shots_on_target", "on target")],
+    "tackles": [("tackles", "tackles")],
+    "interceptions": [("interceptions", "interceptions")],
+    "fouls": [("fouls_committed", "committed")],
+}
+# Verbs each figure of the profile answers: "fouls did X win" or "tackles did X
+# win" ask for something the profile does not count, so they reach the agent.
+PLAYER_STAT_VERBS = {
+    "passes": {"complete", "attempt", "make", "have", "play"},
+    "shots": {"take", "attempt", "make", "have"},
+    "tackles": {"make", "attempt", "have"},
+    "interceptions": {"make", "have", "get"},
+    "fouls": {"commit", "make"},
+}
+
+
+def _match_details(context: dict) -> dict:
+    return retrieve_match_details(json.dumps({
+        "match_id": context["match_id"],
+        "competition_id": context["competition_id"],
+        "season_id": context["season_id"],
+    }))
+
+
+def _answer_score(question: str, context: dict) -> Optional[str]:
+    match = _match_details(context)
+    if not match:
+        return None
+    scoreline = (f"{match['home_team']} {match['home_score']} - "
+                 f"{match['away_score']} {match['away_team']}")
+    if not re.search(r"\bwho won\b", question, re.IGNORECASE):
+        return scoreline
+    if match['home_score'] == match['away_score']:
+        # The match record does not tell whether a penalty shootout followed
+        return None
+    winner = match['home_team'] if match['home_score'] > match['away_score'] else match['away_team']
+    return f"{winner} won: {scoreline}"
+
+
+def _selected_teams(question: str, context: dict, teams: List[str]) -> List[str]:
+    question = question.lower()
+    mentioned = [team for team in teams if team.lower() in question]
+    if mentioned:
+        return mentioned
+    if "home" in question or "away" in question:
+        match = _match_details(context) or {}
+        side = "home_team" if "home" in question else "away_team"
+        if match.get(side) in teams:
+            return [match[side]]
+    return teams
+
+
+def _answer_starting_xi(question: str, context: dict) -> Optional[str]:
+    starting_xi = get_starting_xi(context["match_id"])
+    if not starting_xi:
+        return None
+    lines = []
+    for team in _selected_teams(question, context, list(starting_xi)):
+        players = ", ".join(f"{p['player']} ({p['position']}, #{p['jersey_number']})"
+                            for p in starting_xi[team])
+        lines.append(f"{team} starting XI: {players}")
+    return "\n".join(lines)
+
+
+def resolve_player_name(match_id: int, name: str) -> Optional[str]:
+    """
+    Resolve a (partial) player name against the lineups of a match.
+
+    Returns the full StatsBomb player name when exactly one player matches.
+    """
+    players = get_lineup_index(match_id)["players"]
+    tokens = name.lower().split()
+    names = players["player_name"].fillna("").str.lower()
+    nicknames = players.get("player_nickname", names).fillna("").str.lower()
+    mask = names.eq(name.lower())
+    if not mask.any():
+        mask = names.apply(lambda n: all(t in n for t in tokens))
+        mask |= nicknames.apply(lambda n: bool(n) and all(t in n for t in tokens))
+    candidates = players.loc[mask, "player_name"].unique()
+    return candidates[0] if len(candidates) == 1 else None
+
+
+def _answer_player_stat(question: str, context: dict) -> Optional[str]:
+    found = PLAYER_STAT_PATTERN.search(question)
+    if not found:
+        return None
+    stat = found.group("stat").lower()
+    if found.group("verb").lower() not in PLAYER_STAT_VERBS[stat]:
+        return None
+    player_name = resolve_player_name(context["match_id"], found.group("player").strip(" ?"))
+    if player_name is None:
+        return None
+    profile = json.loads(get_player_profile(context["match_id"], player_name))
+    if "error" in profile:
+        return None
+    figures = ", ".join(f"{label}: {profile[field]}" for field, label in PLAYER_STAT_FIELDS[stat])
+    return f"{player_name} - {stat} ({figures}), {profile['minutes_played']} minutes played."
+
+
+# Ordered from the most to the least specific pattern
+INTENTS = [
+    ("player_stat", PLAYER_STAT_PATTERN, _answer_player_stat),
+    ("starting_xi", STARTING_XI_PATTERN, _answer_starting_xi),
+    ("score", SCORE_PATTERN, _answer_score),
+]
+
+
+def route(question: str, context: dict) -> Optional[str]:
+    """
+    Answer a structured question directly from the match data.
+
+    Args:
+        question (str): The user message.
+        context (dict): The match context (match_id, competition_id, season_id).
+
+    Returns:
+        str: The answer, or None when the question must go to the agent.
+    """
+    if ANALYTICAL_PATTERN.search(question):
+        return None
+    for intent, pattern, handler in INTENTS:
+        if not pattern.search(question):
+            continue
+        started = time.perf_counter()
+        try:
+            answer = handler(question, context)
+        except Exception:
+            answer = None
+        if answer is not None:
+            routing_stats.record_fast_path(intent, time.perf_counter() - started)
+            return answer
+    return None
+
+
+def answer_question(input_data: dict,
+                    agent_factory: Callable = load_agent,
+                    chat_history: Optional[Callable[[], str]] = None) -> dict:
+    """
+    Answer a chat message, falling through to the ReAct agent only for
+    open-ended questions.
+
+    Args:
+        input_data (dict): The agent input (input, match_id, competition_id, season_id, ...);
+            the tool names and descriptions are added from the agent's tools.
+        agent_factory (callable): Builds the agent used for the fall-through.
+        chat_history (callable): Returns the conversation for the agent prompt; only
+            called on the fall-through, so routed answers never summarize the history.
+
+    Returns:
+        dict: The response, with the answer under "output" as returned by the agent.
+    """
+    answer = route(input_data["input"], input_data)
+    if answer is not None:
+        return {"output": answer, "routed": True}
+
+    started = time.perf_counter()
+    # Tools are only loaded (and described to the prompt) when the agent runs
+    agent = agent_factory()
+    input_data = {
+        **input_data,
+        "tool_names": [tool.name for tool in agent.tools],
+        "tools": [tool.description for tool in agent.tools],
+        "chat_history": chat_history() if chat_history is not None else "",
+    }
+    response = agent.invoke(input=input_data, handle_parsing_errors=True)
+    routing_stats.record_agent(time.perf_counter() - started)
+    return response
@@ -3,11 +3,15 @@ from typing import List, Dict
 from langchain_core.tools import Tool
 
 from langchain_community.utilities.wikipedia import WikipediaAPIWrapper
-from langchain_community.tools.wikipedia.tool import WikipediaQueryRun
 
 
-from .self_ask_agent import get_self_ask_agent, search_team_information
-from .football import get_specialist_comments, get_match_details
+from .self_ask_agent import get_self_ask_agent, search_team_information, serper_cache
+from .search_cache import SearchCache
+from .football import get_specialist_comments, get_match_details, get_advanced_metrics_tool
+from .session import ToolSession
+
+# Wikipedia results are cached like the Serper ones (see search_cache.py)
+wikipedia_cache = SearchCache('wikipedia', backend=lambda query: WikipediaAPIWrapper().run(query))
 
 def load_tools(tool_names: List[str] = []) -> Dict[str, Tool]:
     """
@@ -17,14 +21,16 @@ def load_tools(tool_names: List[str] = []) -> Dict[str, Tool]:
         search_team_information,
         get_match_details,
         get_specialist_comments, 
+        get_advanced_metrics_tool,
         Tool.from_function(name='Self-ask agent',
                            func=get_self_ask_agent().invoke,
                            description="A tool to answer complicated questions.  "
                                        "Useful for when you need to answer questions "
                                        "competition events like matches, or team "
                                        "details. Input should be a question."),
-        WikipediaQueryRun(
-            api_wrapper=WikipediaAPIWrapper(),
+        Tool.from_function(
+            name='wikipedia',
+            func=wikipedia_cache.run,
             description="A wrapper around Wikipedia. Useful for when you need"
                         " to answer general questions about people, players, teams,"
                         " competitions, stadiums (the stadium history and "
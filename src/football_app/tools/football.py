@@ -7,7 +7,8 @@ from langchain.chains import LLMChain
 from football_stats.matches import get_player_profile
 from football_stats.matches import get_main_events 
 from football_stats.competitions import get_matches
-from football_stats.matches import get_lineups
+from football_stats.lineups import get_starting_xi
+from football_stats.metrics import get_advanced_metrics
 import json
 import yaml
 from football_stats.matches import get_main_events
@@ -81,42 +82,13 @@ def get_match_details(match_id: int) -> dict:
        
 
 
-def filter_starting_xi(line_ups: str) -> dict:
-    """
-    Filter the starting XI players from the provided lineups.
-    
-    Args:
-        line_ups (str): The JSON string containing the lineups of the teams.
-        
-    Returns:
-    
-    """
-    line_ups_dict = json.loads(line_ups)
-    filter_starting_xi =  {}
-    for team, team_line_up in line_ups_dict.items():
-        filter_starting_xi[team] = []
-        for player in sorted(team_line_up, key= lambda x: x["jersey_number"]):
-            try:
-                positions = player["positions"]["positions"]
-                if positions[0].get("start_reason") == "Starting XI":
-                    filter_starting_xi[team].append({
-                        "player": player["player_name"],
-                        "position": positions[0].get('position'),
-                        "jersey_number": player["jersey_number"]
-                    })
-            except (KeyError, IndexError):
-                continue
-    return filter_starting_xi
-
-
-def get_sport_specialist_comments_about_match(match_details: str, line_ups: str) -> str:
+def get_sport_specialist_comments_about_match(match_details: str, starting_xi: dict) -> str:
     """
     Returns the comments of a sports specialist about a specific match.
-    The comments are generated based on match details and lineups.
+    The comments are generated based on match details and the starting XI
+    of both teams (see `football_stats.lineups.get_starting_xi`).
     """
     
-    line_ups = filter_starting_xi(line_ups)
-    
     agent_prompt = """
     You are a sports commentator with expertise in football (soccer). Respond as
     if you are delivering an engaging analysis for a TV audience. Here is the
@@ -150,7 +122,7 @@ def get_sport_specialist_comments_about_match(match_details: str, line_ups: str)
     """
     llm = GoogleGenerativeAI(model="gemini-pro")
     input_variables={"match_details": yaml.dump(match_details),
-                     "lineups": yaml.dump(line_ups)}
+                     "lineups": yaml.dump(starting_xi)}
     prompt = PromptTemplate.from_template(agent_prompt)
     chain = LLMChain(llm=llm, prompt=prompt, verbose=True)
     return chain.run(
@@ -212,8 +184,8 @@ def get_specialist_comments(action_input:str) -> str:
             }
     """
     match_details = retrieve_match_details(action_input)
-    line_ups = get_lineups(match_details["match_id"])
-    return get_sport_specialist_comments_about_match(match_details, line_ups)
+    starting_xi = get_starting_xi(match_details["match_id"])
+    return get_sport_specialist_comments_about_match(match_details, starting_xi)
 
 @tool
 def get_player_profile_tool(action_input: str) -> str:
@@ -235,4 +207,24 @@ def get_player_profile_tool(action_input: str) -> str:
 
         return get_player_profile(match_id, player_name)
     except Exception as e:
-        return json.dumps({"error": f"Invalid input format or data: {str(e)}"})
\ No newline at end of file
+        return json.dumps({"error": f"Invalid input format or data: {str(e)}"})
+
+@tool
+def get_advanced_metrics_tool(action_input: str) -> str:
+    """
+    Retrieve the advanced metrics of a match for both teams and every player:
+    xG, xG per shot, progressive passes and carries, final-third entries,
+    pressures and duels won.
+
+    Args:
+        action_input (str): JSON string with match_id and an optional player_name.
+          Example: {"match_id": 12345, "player_name": "Messi"}
+
+    Returns:
+        str: JSON string with the team and player metrics.
+    """
+    try:
+        input_data = json.loads(action_input)
+        return get_advanced_metrics(int(input_data["match_id"]), input_data.get("player_name"))
+    except Exception as e:
+        return json.dumps({"error": f"Invalid input format or data: {str(e)}"})
@@ -0,0 +1,196 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+from football_stats.memory_budget import BudgetedCache
+
+
+# Directory of the files the app writes (search cache); resolved on first use
+DATA_DIR_ENV = "FOOTBALL_DATA_DIR"
+SEARCH_CACHE_TTL = float(os.getenv("FOOTBALL_SEARCH_CACHE_TTL", str(7 * 24 * 3600)))
+# "No good result" answers are kept in memory only, and not for long: the
+# backend may answer the next time (or have been failing)
+SEARCH_CACHE_NEGATIVE_TTL = float(os.getenv("FOOTBALL_SEARCH_CACHE_NEGATIVE_TTL", "600"))
+SEARCH_CACHE_MEMORY_ENTRIES = int(os.getenv("FOOTBALL_SEARCH_CACHE_MEMORY_ENTRIES", "256"))
+
+NEGATIVE_RESULT_PATTERN = re.compile(r"^\s*(no good .*result.*)?\s*$", re.IGNORECASE)
+
+
+def data_dir() -> str:
+    """
+    Return the directory of the files written by the app: FOOTBALL_DATA_DIR,
+    or football_insights under the user cache directory.
+    """
+    default = os.path.join(os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+                           "football_insights")
+    return os.getenv(DATA_DIR_ENV, default)
+
+
+def search_cache_path() -> str:
+    return os.getenv("FOOTBALL_SEARCH_CACHE_PATH", os.path.join(data_dir(), "search_cache.db"))
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a search query: case, whitespace and surrounding punctuation are ignored.
+    """
+    query = " ".join(str(query).lower().split())
+    return re.sub(r"^[\W_]+|[\W_]+$", "", query)
+
+
+def is_negative(result: str) -> bool:
+    """
+    Tell whether a backend result is empty or a "no good result" answer.
+    """
+    return not isinstance(result, str) or bool(NEGATIVE_RESULT_PATTERN.match(result))
+
+
+class SearchCache:
+    """
+    TTL cache in front of an external search backend (Serper, Wikipedia).
+
+    Results are kept in a bounded in-memory LRU (charged to the memory budget)
+    and persisted in a SQLite file, so they survive across sessions; identical
+    queries running concurrently share a single backend call. Empty and "no
+    good result" answers are only kept in memory, for SEARCH_CACHE_NEGATIVE_TTL.
+    The backend is any callable taking the query and returning the result
+    text, which lets tests inject a local stand-in.
+    """
+
+    def __init__(self, name: str, backend: Callable[[str], str], ttl: float = SEARCH_CACHE_TTL,
+                 path: Optional[str] = None, negative_ttl: float = SEARCH_CACHE_NEGATIVE_TTL,
+                 max_entries: int = SEARCH_CACHE_MEMORY_ENTRIES):
+        """
+        Args:
+            name (str): Name of the backend, part of the cache key.
+            backend (callable): Runs a query and returns the result text.
+            ttl (float): Lifetime of a result, in seconds.
+            path (str): SQLite file of the persisted results; defaults to
+                FOOTBALL_SEARCH_CACHE_PATH or search_cache.db under FOOTBALL_DATA_DIR,
+                resolved on first use. An empty string keeps results in memory only.
+            negative_ttl (float): Lifetime of an empty or "no good result" answer.
+            max_entries (int): Results kept in memory.
+        """
+        self.name = name
+        self.backend = backend
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.path = path
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "deduplicated": 0, "errors": 0}
+        self._memory = BudgetedCache(f"search_cache-{name}", max_entries=max_entries,
+                                     sizeof=lambda entry: len(entry[0]))
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._created = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        if self.path is None:
+            self.path = search_cache_path()
+        if not self._created:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=5)
+        try:
+            with connection:
+                if not self._created:
+                    connection.execute(
+                        "CREATE TABLE IF NOT EXISTS search_cache ("
+                        " backend TEXT NOT NULL, query TEXT NOT NULL, result TEXT NOT NULL,"
+                        " expires_at REAL NOT NULL, PRIMARY KEY (backend, query))"
+                    )
+                    self._created = True
+                yield connection
+        finally:
+            connection.close()
+
+    def _load(self, key: str) -> Optional[tuple]:
+        """
+        Return the (result, expires_at) entry of a query; expired entries are
+        dropped as they are read.
+        """
+        entry = self._memory.get(key)
+        if entry is not None:
+            if entry[1] <= time.time():
+                self._memory.pop(key)
+            return entry
+        if self.path == "":
+            return None
+        with self._connect() as connection:
+            entry = connection.execute(
+                "SELECT result, expires_at FROM search_cache WHERE backend = ? AND query = ?",
+                (self.name, key)).fetchone()
+            if entry is not None and entry[1] <= time.time():
+                connection.execute("DELETE FROM search_cache WHERE backend = ? AND query = ?",
+                                   (self.name, key))
+        if entry is not None and entry[1] > time.time():
+            self._memory.put(key, entry)
+        return entry
+
+    def _store(self, key: str, result: str) -> None:
+        negative = is_negative(result)
+        entry = (result, time.time() + (self.negative_ttl if negative else self.ttl))
+        self._memory.put(key, entry)
+        if self.path != "" and not negative:
+            with self._connect() as connection:
+                connection.execute("INSERT OR REPLACE INTO search_cache VALUES (?, ?, ?, ?)",
+                                   (self.name, key, *entry))
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    def run(self, query: str) -> str:
+        """
+        Return the result of `query`, calling the backend only on a miss.
+        """
+        key = normalize_query(query)
+        entry = self._load(key)
+        if entry is not None:
+            result, expires_at = entry
+            if expires_at > time.time():
+                self._count("hits")
+                return result
+            self._count("expired")
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+                self.stats["misses"] += 1
+            else:
+                self.stats["deduplicated"] += 1
+        if not owner:
+            return future.result()
+
+        try:
+            result = self.backend(query)
+            self._store(key, result)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            self._count("errors")
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def clear(self) -> None:
+        self._memory.clear()
+        if self.path != "":
+            with self._connect() as connection:
+                connection.execute("DELETE FROM search_cache WHERE backend = ?", (self.name,))
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"] + stats["deduplicated"]
+        stats["hit_rate"] = round((stats["hits"] + stats["deduplicated"]) / lookups, 3) if lookups else 0.0
+        return stats
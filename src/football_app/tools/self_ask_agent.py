@@ -4,6 +4,7 @@ from langchain_community.utilities import GoogleSerperAPIWrapper
 from langchain_google_genai import GoogleGenerativeAI
 import os
 from dotenv import load_dotenv
+from .search_cache import SearchCache
 
 # Carregar variáveis do .env
 load_dotenv()
@@ -13,9 +14,14 @@ def get_search_utility():
     return GoogleSerperAPIWrapper(serper_api_key=SERPER_API_KEY)
 
 
+# Serper results are cached (TTL, on disk) and shared by every search tool.
+# Tests can replace the backend: `serper_cache.backend = fake_search`.
+serper_cache = SearchCache('serper', backend=lambda query: get_search_utility().run(query))
+
+
 search_team_information = Tool(
     name='search_team_information',
-    func=get_search_utility().run,
+    func=serper_cache.run,
     description='Useful for when you want to search '
                 'for information about a specific team or player.'
 )
@@ -28,7 +34,7 @@ def get_self_ask_agent() -> AgentExecutor:
     llm = GoogleGenerativeAI(model="gemini-pro", temperature=0.2)
     intermediate_search_tool = Tool(
         name='Intermediate Answer',
-        func=get_search_utility().run,
+        func=serper_cache.run,
         description='Search'
     )
     prompt = hub.pull("hwchase17/self-ask-with-search")
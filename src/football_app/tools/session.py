@@ -0,0 +1,128 @@
+import json
+import threading
+import weakref
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.tools import BaseTool, Tool
+
+from football_stats.memory_budget import BudgetedCache, budget
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {str(k).strip().lower(): _canonical(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_canonical(v) for v in value]
+    if isinstance(value, str):
+        value = value.strip()
+        return int(value) if value.isdigit() else value
+    return value
+
+
+def normalize_tool_input(tool_input: Any) -> str:
+    """
+    Normalize a tool input so equivalent inputs share the same memo key.
+
+    JSON inputs are compared by content (key order, whitespace and numeric
+    strings such as "12345" vs 12345 do not matter); free text is compared
+    case-insensitively with collapsed whitespace.
+    """
+    if isinstance(tool_input, str):
+        text = tool_input.strip().strip("`").strip()
+        try:
+            tool_input = json.loads(text)
+        except ValueError:
+            return " ".join(text.lower().split())
+    return json.dumps(_canonical(tool_input), sort_keys=True, default=str)
+
+
+def _shutdown(pool: ThreadPoolExecutor, observations: BudgetedCache) -> None:
+    pool.shutdown(wait=False, cancel_futures=True)
+    observations.evict_bytes(observations.size)
+    budget.unregister(observations)
+
+
+class ToolSession:
+    """
+    Memoizes tool observations for one conversation.
+
+    Concurrent calls with the same normalized input share one execution, and
+    the observations are kept in an LRU cache charged to the memory budget.
+
+    The ReAct agent (agent.py) plans a single action per step, so the calls of
+    one conversation run one after another; the session saves the repeated
+    calls, it does not parallelize a step.
+    """
+
+    def __init__(self, max_workers: int = 4, max_entries: int = 128,
+                 max_bytes: Optional[int] = 16 * 1024 * 1024):
+        self._lock = threading.Lock()
+        self._running: Dict[Tuple[str, str], Future] = {}
+        self._observations = BudgetedCache(f"tool_session-{id(self):x}", max_bytes=max_bytes,
+                                           max_entries=max_entries)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool-session")
+        # Streamlit has no end-of-session hook: release everything once the
+        # session state holding this object is garbage collected
+        self._finalizer = weakref.finalize(self, _shutdown, self._pool, self._observations)
+        self.hits = 0
+        self.misses = 0
+
+    def submit(self, tool: BaseTool, tool_input: Any) -> Future:
+        """
+        Start the tool call unless the same call is already cached or running.
+        """
+        key = (tool.name, normalize_tool_input(tool_input))
+        with self._lock:
+            future = self._running.get(key)
+            if future is None:
+                observation = self._observations.get(key)
+                if observation is not None:
+                    future = Future()
+                    future.set_result(observation)
+            if future is not None:
+                self.hits += 1
+                return future
+            self.misses += 1
+            future = self._pool.submit(tool.invoke, tool_input)
+            self._running[key] = future
+        future.add_done_callback(lambda f: self._finish(key, f))
+        return future
+
+    def _finish(self, key: Tuple[str, str], future: Future) -> None:
+        # Failed calls are not kept, so the next identical call retries them
+        if not future.cancelled() and future.exception() is None:
+            self._observations.put(key, future.result())
+        with self._lock:
+            if self._running.get(key) is future:
+                del self._running[key]
+
+    def call(self, tool: BaseTool, tool_input: Any) -> Any:
+        return self.submit(tool, tool_input).result()
+
+    def wrap(self, tool: BaseTool) -> Tool:
+        """
+        Return a copy of the tool whose observations are memoized in this session.
+        """
+        return Tool(name=tool.name,
+                    description=tool.description,
+                    func=lambda tool_input: self.call(tool, tool_input))
+
+    def wrap_all(self, tools: List[BaseTool]) -> List[Tool]:
+        return [self.wrap(tool) for tool in tools]
+
+    def clear(self) -> None:
+        self._observations.evict_bytes(self._observations.size)
+
+    def close(self) -> None:
+        """
+        Stop the worker threads and drop the observations (the session is unusable afterwards).
+        """
+        self._finalizer()
+
+    def stats(self) -> dict:
+        with self._lock:
+            running = len(self._running)
+        return {"entries": self._observations.stats()["entries"], "running": running,
+                "hits": self.hits, "misses": self.misses}
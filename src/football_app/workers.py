@@ -0,0 +1,118 @@
+import multiprocessing
+import os
+import threading
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Optional
+
+from .football_stats.memory_budget import (budget, measure, memory_stats, record_child,
+                                           DEFAULT_REQUEST_BYTES)
+
+
+def _default_cpu_workers() -> int:
+    # Every API process (uvicorn --workers N, announced with WEB_CONCURRENCY)
+    # starts its own pool, each process importing pandas and langchain: the
+    # cores are shared between the API processes and each pool stays small.
+    # With fewer than 2 cores per API process a pool only adds IPC and another
+    # interpreter's memory (measured slower than inline on 1 core), so the
+    # work runs inline.
+    api_workers = max(int(os.getenv("WEB_CONCURRENCY", "1")), 1)
+    cores = (os.cpu_count() or 1) // api_workers
+    return min(2, cores) if cores >= 2 else 0
+
+
+# Number of processes for the CPU-bound pandas work per API process; 0 runs it
+# inline in the request thread.
+CPU_WORKERS = int(os.getenv("FOOTBALL_CPU_WORKERS", str(_default_cpu_workers())))
+# Memory budget of the caches (lineups, metrics) of each pool process, taken
+# from the budget of the API process
+POOL_CACHE_BYTES = int(os.getenv("FOOTBALL_POOL_CACHE_BYTES",
+                                 str(budget.limit // 4 // max(CPU_WORKERS, 1))))
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_initializer: Optional[Callable] = None
+_initargs: tuple = ()
+# Cache bytes last reported by each pool process
+_pool_cache_bytes: Dict[int, int] = {}
+
+
+def configure(initializer: Optional[Callable] = None, initargs: tuple = ()) -> None:
+    """
+    Set a function run at the start of every pool process (e.g. to install
+    the load-test stand-ins). Must be called before the pool is created.
+    """
+    global _initializer, _initargs
+    _initializer, _initargs = initializer, initargs
+
+
+def _init_pool_process(cache_bytes: int, initializer: Optional[Callable], initargs: tuple) -> None:
+    budget.restrict(cache_bytes)
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def _pool_cache_usage() -> int:
+    return sum(_pool_cache_bytes.values())
+
+
+def get_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Return the process pool, created on first use.
+    """
+    global _pool
+    if CPU_WORKERS <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a process that already runs server threads is unsafe
+            _pool = ProcessPoolExecutor(max_workers=CPU_WORKERS,
+                                        mp_context=multiprocessing.get_context("spawn"),
+                                        initializer=_init_pool_process,
+                                        initargs=(POOL_CACHE_BYTES, _initializer, _initargs))
+            # The pool caches are bounded by POOL_CACHE_BYTES each; their
+            # reported size counts against the budget of this process
+            budget.register_external("pool_caches", _pool_cache_usage)
+        return _pool
+
+
+def _measured_call(func: Callable, args: tuple):
+    # Runs in the pool process: return the result with its memory measurement
+    with measure(func.__name__, stats=None) as measurement:
+        result = func(*args)
+    measurement["pid"] = os.getpid()
+    measurement["cache_bytes"] = budget.used
+    return result, measurement
+
+
+def run_cpu_bound(func: Callable, *args):
+    """
+    Run a module-level function in the process pool and wait for its result.
+
+    The calling thread only waits, so it does not hold the GIL while the
+    pandas work runs. Match events are read by the pool processes through
+    the shared cache, so only the (small) JSON result crosses processes.
+
+    The call first reserves its expected memory (the largest footprint seen
+    for the function so far) in the global memory budget, and may therefore
+    wait or raise MemoryBudgetExceeded under load.
+    """
+    name = func.__name__
+    with budget.reservation(memory_stats.estimate(name) or DEFAULT_REQUEST_BYTES):
+        pool = get_pool()
+        if pool is None:
+            with measure(name):
+                return func(*args)
+        result, measurement = pool.submit(_measured_call, func, args).result()
+        _pool_cache_bytes[measurement["pid"]] = measurement["cache_bytes"]
+        record_child(measurement)
+        return result
+
+
+def shutdown() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+            _pool_cache_bytes.clear()